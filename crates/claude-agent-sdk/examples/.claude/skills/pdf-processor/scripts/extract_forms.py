@@ -9,6 +9,13 @@ import sys
 import json
 from pathlib import Path
 
+FIELD_TYPES = {
+    '/Btn': 'button',
+    '/Tx': 'text',
+    '/Ch': 'choice',
+    '/Sig': 'signature',
+}
+
 def extract_form_data(pdf_path: str) -> dict:
     """Extract form data from PDF."""
     try:
@@ -24,10 +31,11 @@ def extract_form_data(pdf_path: str) -> dict:
     }
 
     try:
-        reader = PdfReader(pdf_path)
+        reader = PdfReader(pdf_path, strict=False)
+        fields = reader.get_fields()
 
-        if reader.get_fields():
-            for field_name, field in reader.get_fields().items():
+        if fields:
+            for field_name, field in fields.items():
                 field_info = {}
 
                 # Get field value
@@ -36,15 +44,9 @@ def extract_form_data(pdf_path: str) -> dict:
 
                 # Get field type
                 if '/FT' in field:
-                    field_type = field['/FT']
-                    if field_type == '/Btn':
-                        field_info['type'] = 'button'
-                    elif field_type == '/Tx':
-                        field_info['type'] = 'text'
-                    elif field_type == '/Ch':
-                        field_info['type'] = 'choice'
-                    elif field_type == '/Sig':
-                        field_info['type'] = 'signature'
+                    field_type = FIELD_TYPES.get(field['/FT'])
+                    if field_type:
+                        field_info['type'] = field_type
 
                 # Get flags
                 if '/Ff' in field:
@@ -5,13 +5,25 @@ PDF Merge Script
 Merges multiple PDF files into a single PDF.
 """
 
+import argparse
+import io
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-def merge_pdfs(output_path: str, *input_paths: str) -> bool:
-    """Merge multiple PDFs into one."""
+def _read_pdf_bytes(pdf_path: str) -> bytes:
+    """Read an input PDF into memory."""
+    with open(pdf_path, 'rb') as f:
+        return f.read()
+
+def merge_pdfs(output_path: str, *input_paths: str, jobs: int = 1) -> bool:
+    """Merge multiple PDFs into one.
+
+    With jobs > 1 the input files are read concurrently; parsing and
+    appending stay in this process because PdfWriter is not shareable.
+    """
     try:
-        from pypdf import PdfMerger
+        from pypdf import PdfReader, PdfWriter
     except ImportError:
         print("Error: pypdf not installed. Run: pip install pypdf")
         return False
@@ -27,15 +39,23 @@ def merge_pdfs(output_path: str, *input_paths: str) -> bool:
             return False
 
     try:
-        merger = PdfMerger()
+        writer = PdfWriter()
 
-        for pdf_path in input_paths:
+        if jobs > 1 and len(input_paths) > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                sources = [io.BytesIO(data)
+                           for data in executor.map(_read_pdf_bytes, input_paths)]
+        else:
+            sources = input_paths
+
+        for pdf_path, source in zip(input_paths, sources):
             print(f"Adding: {pdf_path}")
-            merger.append(pdf_path)
+            writer.append(PdfReader(source, strict=False))
 
         print(f"Writing: {output_path}")
-        merger.write(output_path)
-        merger.close()
+        with open(output_path, 'wb') as f:
+            writer.write(f)
+        writer.close()
 
         return True
 
@@ -44,14 +64,18 @@ def merge_pdfs(output_path: str, *input_paths: str) -> bool:
         return False
 
 def main():
-    if len(sys.argv) < 3:
-        print("Usage: python merge.py <output_pdf> <input_pdf1> [input_pdf2] ...")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        usage="python merge.py [--jobs N] <output_pdf> <input_pdf1> [input_pdf2] ...")
+    parser.add_argument('output_pdf')
+    parser.add_argument('input_pdfs', nargs='+')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of input files to read concurrently')
+    args = parser.parse_args()
 
-    output_path = sys.argv[1]
-    input_paths = sys.argv[2:]
+    output_path = args.output_pdf
+    input_paths = args.input_pdfs
 
-    if merge_pdfs(output_path, *input_paths):
+    if merge_pdfs(output_path, *input_paths, jobs=args.jobs):
         print(f"✓ Successfully merged {len(input_paths)} PDFs into {output_path}")
         sys.exit(0)
     else:
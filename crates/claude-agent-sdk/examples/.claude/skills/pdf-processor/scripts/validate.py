@@ -5,11 +5,68 @@ PDF Validation Script
 Validates PDF files for corruption, encryption, and accessibility.
 """
 
+import argparse
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-def validate_pdf(pdf_path: str) -> dict:
-    """Validate a PDF file."""
+def validate_pdf(pdf_path: str, deep: bool = False) -> dict:
+    """Validate a PDF file.
+
+    Only the document structure is read with pypdf; pass deep=True to run
+    pdfplumber's layout-level checks instead.
+    """
+    if deep:
+        return validate_pdf_layout(pdf_path)
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return {
+            'valid': False,
+            'error': 'pypdf not installed. Run: pip install pypdf'
+        }
+
+    result = {
+        'valid': True,
+        'path': pdf_path,
+        'checks': {}
+    }
+
+    try:
+        reader = PdfReader(pdf_path, strict=False)
+
+        # Check if encrypted (an empty user password still allows reading)
+        result['checks']['is_encrypted'] = reader.is_encrypted
+        if reader.is_encrypted and not reader.decrypt(''):
+            result['valid'] = False
+            result['error'] = 'PDF is encrypted'
+            return result
+
+        # Check page count
+        result['checks']['page_count'] = len(reader.pages)
+
+        # Check metadata
+        result['checks']['has_metadata'] = bool(reader.metadata)
+
+        # Try to access first page
+        if reader.pages:
+            mediabox = reader.pages[0].mediabox
+            result['checks']['first_page_accessible'] = True
+            result['checks']['page_size'] = (float(mediabox.width), float(mediabox.height))
+        else:
+            result['checks']['first_page_accessible'] = False
+            result['valid'] = False
+
+    except Exception as e:
+        result['valid'] = False
+        result['error'] = str(e)
+
+    return result
+
+def validate_pdf_layout(pdf_path: str) -> dict:
+    """Validate a PDF file with pdfplumber's layout parser."""
     try:
         import pdfplumber
     except ImportError:
@@ -50,29 +107,43 @@ def validate_pdf(pdf_path: str) -> dict:
 
     return result
 
+def validate_pdfs(pdf_paths: list, jobs: int = 1, deep: bool = False) -> list:
+    """Validate several PDF files, optionally in parallel worker processes."""
+    validate = partial(validate_pdf, deep=deep)
+    if jobs > 1 and len(pdf_paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(validate, pdf_paths))
+    return [validate(pdf_path) for pdf_path in pdf_paths]
+
 def main():
-    if len(sys.argv) < 2:
-        print("Usage: python validate.py <pdf_path>")
-        sys.exit(1)
-
-    pdf_path = sys.argv[1]
-
-    if not Path(pdf_path).exists():
-        print(f"Error: File not found: {pdf_path}")
-        sys.exit(1)
-
-    result = validate_pdf(pdf_path)
-
-    if result['valid']:
-        print(f"✓ PDF is valid: {pdf_path}")
-        print(f"  Pages: {result['checks'].get('page_count', 'Unknown')}")
-        print(f"  Metadata: {'Yes' if result['checks'].get('has_metadata') else 'No'}")
-        print(f"  Size: {result['checks'].get('page_size', 'Unknown')}")
-        sys.exit(0)
-    else:
-        print(f"✗ PDF is invalid: {pdf_path}")
-        print(f"  Error: {result.get('error', 'Unknown error')}")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        usage="python validate.py [--jobs N] [--deep] <pdf_path> [pdf_path2] ...")
+    parser.add_argument('pdf_paths', nargs='+')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='Number of PDFs to validate in parallel')
+    parser.add_argument('--deep', action='store_true',
+                        help='Validate with pdfplumber layout checks instead of pypdf')
+    args = parser.parse_args()
+
+    for pdf_path in args.pdf_paths:
+        if not Path(pdf_path).exists():
+            print(f"Error: File not found: {pdf_path}")
+            sys.exit(1)
+
+    all_valid = True
+
+    for pdf_path, result in zip(args.pdf_paths, validate_pdfs(args.pdf_paths, args.jobs, args.deep)):
+        if result['valid']:
+            print(f"✓ PDF is valid: {pdf_path}")
+            print(f"  Pages: {result['checks'].get('page_count', 'Unknown')}")
+            print(f"  Metadata: {'Yes' if result['checks'].get('has_metadata') else 'No'}")
+            print(f"  Size: {result['checks'].get('page_size', 'Unknown')}")
+        else:
+            all_valid = False
+            print(f"✗ PDF is invalid: {pdf_path}")
+            print(f"  Error: {result.get('error', 'Unknown error')}")
+
+    sys.exit(0 if all_valid else 1)
 
 if __name__ == '__main__':
     main()
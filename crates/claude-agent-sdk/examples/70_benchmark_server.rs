@@ -0,0 +1,70 @@
+//! Benchmark Server Example
+//!
+//! A long-lived worker for `scripts/benchmark_sdk_comparison.py`. Instead of
+//! spawning `cargo run` once per benchmark iteration, the script starts this
+//! binary once and feeds it prompts over stdin.
+//!
+//! # Protocol
+//!
+//! - Input: one prompt per line on stdin
+//! - Output: one JSON object per line on stdout, e.g. `{"elapsed_ms": 812.4}`
+//!   on success or `{"error": "..."}` on failure
+//! - While a query is in flight, `{"keepalive": true}` is written every
+//!   second, so the caller can tell a slow API call from a wedged process
+//!
+//! Nothing else is written to stdout, so the caller can `readline()` until it
+//! gets a line without `keepalive`. The process exits when stdin is closed.
+
+use anyhow::Result;
+use claude_agent_sdk::{query, ClaudeAgentOptions, PoolConfig};
+use serde_json::json;
+use std::time::{Duration, Instant};
+use tokio::io::{AsyncBufReadExt, AsyncWriteExt, BufReader};
+
+/// How often a keepalive line is written while a query is running
+const KEEPALIVE_INTERVAL: Duration = Duration::from_secs(1);
+
+#[tokio::main]
+async fn main() -> Result<()> {
+    // Reuse CLI processes across prompts, the same way a server would
+    let options = ClaudeAgentOptions::builder()
+        .pool_config(PoolConfig::new().enabled())
+        .max_turns(1)
+        .build();
+
+    let mut lines = BufReader::new(tokio::io::stdin()).lines();
+    let mut stdout = tokio::io::stdout();
+
+    while let Some(prompt) = lines.next_line().await? {
+        if prompt.trim().is_empty() {
+            continue;
+        }
+
+        let start = Instant::now();
+        let pending = query(prompt, Some(options.clone()));
+        tokio::pin!(pending);
+
+        let mut keepalive = tokio::time::interval(KEEPALIVE_INTERVAL);
+        keepalive.tick().await; // The first tick completes immediately
+
+        let result = loop {
+            tokio::select! {
+                result = &mut pending => break result,
+                _ = keepalive.tick() => {
+                    stdout.write_all(b"{\"keepalive\":true}\n").await?;
+                    stdout.flush().await?;
+                }
+            }
+        };
+
+        let response = match result {
+            Ok(_) => json!({ "elapsed_ms": start.elapsed().as_secs_f64() * 1000.0 }),
+            Err(e) => json!({ "error": e.to_string() }),
+        };
+
+        stdout.write_all(format!("{}\n", response).as_bytes()).await?;
+        stdout.flush().await?;
+    }
+
+    Ok(())
+}
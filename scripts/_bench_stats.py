@@ -0,0 +1,71 @@
+"""
+基准测试统计工具
+
+benchmark_sdk_comparison、quick_benchmark 和 detailed_benchmark 共用的
+延迟统计计算。安装了 NumPy 时使用向量化计算, 否则回退到 statistics 模块。
+"""
+
+import math
+import statistics
+from dataclasses import dataclass
+from typing import List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@dataclass
+class BenchmarkResult:
+    """基准测试结果"""
+    name: str
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    p99_ms: float
+    min_ms: float
+    max_ms: float
+    std_dev_ms: float
+    ci95_ms: float  # 平均值95%置信区间的半宽
+    samples: int
+
+
+def compute_stats(times: List[float], name: str = "") -> BenchmarkResult:
+    """计算延迟统计数据 (毫秒)
+
+    分位数使用线性插值, 样本较少时同样有意义。
+    """
+    n = len(times)
+
+    if np is None:
+        mean = statistics.mean(times)
+        median = statistics.median(times)
+        min_ms = min(times)
+        max_ms = max(times)
+        std_dev = statistics.stdev(times) if n > 1 else 0
+        if n > 1:
+            percentiles = statistics.quantiles(times, n=100, method='inclusive')
+            p95, p99 = percentiles[94], percentiles[98]
+        else:
+            p95 = p99 = times[0]
+    else:
+        arr = np.asarray(times, dtype=np.float64)
+        mean = float(arr.mean())
+        min_ms = float(arr.min())
+        max_ms = float(arr.max())
+        std_dev = float(arr.std(ddof=1)) if n > 1 else 0
+        median, p95, p99 = (float(q) for q in np.quantile(arr, [0.5, 0.95, 0.99]))
+
+    return BenchmarkResult(
+        name=name,
+        mean_ms=mean,
+        median_ms=median,
+        p95_ms=p95,
+        p99_ms=p99,
+        min_ms=min_ms,
+        max_ms=max_ms,
+        std_dev_ms=std_dev,
+        ci95_ms=1.96 * std_dev / math.sqrt(n),
+        samples=n
+    )
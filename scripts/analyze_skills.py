@@ -10,77 +10,210 @@ SKILL.md 深度分析和效果验证脚本
 5. 学习路径完整性
 """
 
+import heapq
 import os
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 import json
 
+import yaml
+
+try:
+    import ahocorasick  # pyahocorasick, 可选依赖
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson  # 可选依赖, 加速 JSON 报告序列化
+except ImportError:
+    orjson = None
+
+
+# 分析结果缓存 (按 SKILL.md 的 mtime 和大小失效); 分析逻辑变化时递增版本号
+CACHE_DIR = Path(".cache") / "analyze_skills"
+CACHE_VERSION = 3
+
+# 以下模式直接匹配 SKILL.md 的原始 UTF-8 字节, 只有 frontmatter 需要解码
+
+# 代码块
+CODE_BLOCK_PATTERN = re.compile(rb'```\w*\n(.*?)\n```', re.DOTALL)
+
+# 语言按每个 ```lang 标记统计, 包括嵌套在 ```markdown 示例中的代码块
+LANGUAGE_PATTERN = re.compile(rb'```(\w+)')
+
+# 标题 / 列表项的单次扫描; 与代码块分开匹配,
+# 代码块 (如 ```markdown 示例) 内的结构同样计入
+STRUCTURE_PATTERN = re.compile(
+    rb'(?P<head>^#+\s+.+$)'
+    rb'|(?P<li>^\s*[-*+]\s+)',
+    re.MULTILINE
+)
+
+# 表格行单独匹配: 标题或列表项所在的行 (如 "# 标题 | a |") 同样可以计为表格行
+TABLE_PATTERN = re.compile(rb'\|.*\|')
+
+FRONTMATTER_PATTERN = re.compile(rb'---\n(.*?)\n---\n?(.*)', re.DOTALL)
+
+# U+4E00..U+9FFF 的 UTF-8 编码 (E4 B8 80 .. E9 BF BF)
+CJK_PATTERN = re.compile(rb'\xe4[\xb8-\xbf][\x80-\xbf]|[\xe5-\xe9][\x80-\xbf][\x80-\xbf]')
+
+# 每个非空行匹配一次 (行首空白之后的第一个非空白字符)
+NON_EMPTY_LINE_PATTERN = re.compile(rb'^[^\S\n]*\S', re.MULTILINE)
+
+# 内容关键词 (匹配小写后的内容)
+INTRODUCTION_WORDS = frozenset({'introduction', '介绍', 'overview', '概述'})
+EXAMPLE_WORDS = frozenset({'example', '示例', 'demo', '演示'})
+BEST_PRACTICE_WORDS = frozenset({'best practice', '最佳实践', 'recommendation', '建议'})
+CODE_BEST_PRACTICE_WORDS = frozenset({'best practice', '最佳实践', 'recommend', '建议'})
+TROUBLESHOOTING_WORDS = frozenset({'troubleshooting', '故障排除', 'common issue', '常见问题'})
+TOOLS_WORDS = frozenset({'tools', '工具', 'resources', '资源'})
+
+# 技术关键词
+TECH_KEYWORDS = {
+    'languages': ['python', 'javascript', 'typescript', 'rust', 'go', 'java',
+                 'swift', 'kotlin', 'ruby', 'php', 'c\+\+', 'c#'],
+    'frameworks': ['react', 'vue', 'angular', 'django', 'flask', 'fastapi',
+                  'spring', 'express', 'gin', 'echo', 'tensorflow', 'pytorch'],
+    'databases': ['postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch',
+                 'dynamodb', 'cassandra', 'neo4j'],
+    'cloud': ['aws', 'azure', 'gcp', 'alibaba', 'terraform', 'kubernetes',
+             'docker', 'ansible', 'chef', 'puppet'],
+    'tools': ['git', 'jenkins', 'github actions', 'gitlab ci', 'travis ci',
+             'prometheus', 'grafana', 'elk', 'jenkins'],
+    'concepts': ['microservices', 'serverless', 'devops', 'cicd', 'tdd',
+                'bdd', 'agile', 'scrum', 'kubernetes', 'docker']
+}
+
+KEYWORDS = (
+    INTRODUCTION_WORDS | EXAMPLE_WORDS | BEST_PRACTICE_WORDS
+    | CODE_BEST_PRACTICE_WORDS | TROUBLESHOOTING_WORDS | TOOLS_WORDS
+    | frozenset(word for words in TECH_KEYWORDS.values() for word in words)
+)
+
+
+def _build_automaton():
+    """构建关键词 Aho-Corasick 自动机 (未安装 pyahocorasick 时返回 None)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in KEYWORDS:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+KEYWORD_AUTOMATON = _build_automaton()
+
+# 未安装 pyahocorasick 时直接在字节内容上查找编码后的关键词
+KEYWORD_BYTES = {word.encode('utf-8'): word for word in KEYWORDS}
+
+
+def scan_markdown(content: bytes, content_lower: bytes) -> Dict:
+    """扫描 markdown 结构, 供各分析函数共享
+
+    代码块只做流式统计, 不保留代码块文本; 错误处理关键词直接在
+    content_lower 的对应区间内查找, 不再为每个代码块复制小写副本。
+    """
+    code_blocks = 0
+    code_lines = 0
+    languages = Counter(lang.decode('ascii') for lang in LANGUAGE_PATTERN.findall(content))
+    has_comments = False
+    has_error_handling = False
+
+    for m in CODE_BLOCK_PATTERN.finditer(content):
+        code_blocks += 1
+        block = m.group(1)
+        code_lines += block.count(b'\n') + 1
+        if not has_comments:
+            has_comments = b'//' in block or b'#' in block or b'/*' in block
+        if not has_error_handling:
+            start, end = m.span(1)
+            has_error_handling = (content_lower.find(b'try', start, end) != -1
+                                  or content_lower.find(b'catch', start, end) != -1
+                                  or content_lower.find(b'error', start, end) != -1)
+
+    sections = 0
+    list_items = 0
+    for m in STRUCTURE_PATTERN.finditer(content):
+        if m.lastgroup == 'head':
+            sections += 1
+        else:
+            list_items += 1
+    tables = sum(1 for _ in TABLE_PATTERN.finditer(content))
+
+    return {
+        'code_blocks': code_blocks,
+        'code_lines': code_lines,
+        'languages': languages,
+        'has_comments': has_comments,
+        'has_error_handling': has_error_handling,
+        'sections': sections,
+        'list_items': list_items,
+        'tables': tables,
+    }
 
-def analyze_code_examples(content: str) -> Dict:
+
+def find_keywords(content_lower: bytes) -> Set[str]:
+    """一次扫描找出 (小写后的) 内容中出现的所有关键词"""
+    if KEYWORD_AUTOMATON is not None:
+        text = content_lower.decode('utf-8', errors='replace')
+        return {word for _, word in KEYWORD_AUTOMATON.iter(text)}
+    return {word for encoded, word in KEYWORD_BYTES.items() if encoded in content_lower}
+
+
+def analyze_code_examples(scan: Dict, keywords: Set[str]) -> Dict:
     """分析代码示例"""
     # 检测代码块
-    code_blocks = re.findall(r'```[\w]*\n(.*?)\n```', content, re.DOTALL)
-
-    # 统计编程语言
-    languages = re.findall(r'```(\w+)', content)
+    code_blocks = scan['code_blocks']
 
     # 统计代码行数
-    total_code_lines = sum(len(block.split('\n')) for block in code_blocks)
+    total_code_lines = scan['code_lines']
 
     # 检测代码质量指标
-    has_comments = any('//' in block or '#' in block or '/*' in block
-                       for block in code_blocks)
-    has_error_handling = any('try' in block.lower() or 'catch' in block.lower()
-                             or 'error' in block.lower() for block in code_blocks)
-    has_best_practices = any(word in content.lower() for word in
-                            ['best practice', '最佳实践', 'recommend', '建议'])
+    has_best_practices = bool(keywords & CODE_BEST_PRACTICE_WORDS)
 
     return {
-        'code_blocks': len(code_blocks),
-        'languages': Counter(languages),
+        'code_blocks': code_blocks,
+        'languages': dict(scan['languages']),
         'total_code_lines': total_code_lines,
-        'has_comments': has_comments,
-        'has_error_handling': has_error_handling,
+        'has_comments': scan['has_comments'],
+        'has_error_handling': scan['has_error_handling'],
         'has_best_practices': has_best_practices,
-        'avg_code_lines_per_block': total_code_lines / len(code_blocks) if code_blocks else 0
+        'avg_code_lines_per_block': total_code_lines / code_blocks if code_blocks else 0
     }
 
 
-def analyze_content_quality(content: str) -> Dict:
+def analyze_content_quality(content: bytes, scan: Dict, keywords: Set[str]) -> Dict:
     """分析内容质量"""
     # 统计章节
-    sections = re.findall(r'^#+\s+(.+)$', content, re.MULTILINE)
+    sections = scan['sections']
 
     # 统计列表项
-    list_items = len(re.findall(r'^\s*[-*+]\s+', content, re.MULTILINE))
+    list_items = scan['list_items']
 
     # 统计表格
-    tables = len(re.findall(r'\|.*\|', content))
+    tables = scan['tables']
 
     # 检测关键内容
-    has_introduction = any(word in content.lower() for word in
-                          ['introduction', '介绍', 'overview', '概述'])
-    has_examples = any(word in content.lower() for word in
-                      ['example', '示例', 'demo', '演示'])
-    has_best_practices = any(word in content.lower() for word in
-                            ['best practice', '最佳实践', 'recommendation', '建议'])
-    has_troubleshooting = any(word in content.lower() for word in
-                             ['troubleshooting', '故障排除', 'common issue', '常见问题'])
-    has_tools = any(word in content.lower() for word in
-                   ['tools', '工具', 'resources', '资源'])
+    has_introduction = bool(keywords & INTRODUCTION_WORDS)
+    has_examples = bool(keywords & EXAMPLE_WORDS)
+    has_best_practices = bool(keywords & BEST_PRACTICE_WORDS)
+    has_troubleshooting = bool(keywords & TROUBLESHOOTING_WORDS)
+    has_tools = bool(keywords & TOOLS_WORDS)
 
     # 检测中文内容
-    has_chinese = bool(re.search(r'[\u4e00-\u9fff]', content))
+    has_chinese = bool(CJK_PATTERN.search(content))
 
     # 内容深度指标
-    lines = content.split('\n')
-    non_empty_lines = [l for l in lines if l.strip()]
-    content_depth_score = len(non_empty_lines) / 100  # 每100行1分
+    non_empty_lines = sum(1 for _ in NON_EMPTY_LINE_PATTERN.finditer(content))
+    content_depth_score = non_empty_lines / 100  # 每100行1分
 
     return {
-        'sections': len(sections),
+        'sections': sections,
         'list_items': list_items,
         'tables': tables,
         'has_introduction': has_introduction,
@@ -90,73 +223,54 @@ def analyze_content_quality(content: str) -> Dict:
         'has_tools': has_tools,
         'has_chinese': has_chinese,
         'content_depth_score': min(content_depth_score, 10),  # 最高10分
-        'non_empty_lines': len(non_empty_lines)
+        'non_empty_lines': non_empty_lines
     }
 
 
-def analyze_technical_coverage(content: str) -> Dict:
+def analyze_technical_coverage(keywords: Set[str]) -> Dict:
     """分析技术覆盖"""
-    # 技术关键词
-    tech_keywords = {
-        'languages': ['python', 'javascript', 'typescript', 'rust', 'go', 'java',
-                     'swift', 'kotlin', 'ruby', 'php', 'c\+\+', 'c#'],
-        'frameworks': ['react', 'vue', 'angular', 'django', 'flask', 'fastapi',
-                      'spring', 'express', 'gin', 'echo', 'tensorflow', 'pytorch'],
-        'databases': ['postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch',
-                     'dynamodb', 'cassandra', 'neo4j'],
-        'cloud': ['aws', 'azure', 'gcp', 'alibaba', 'terraform', 'kubernetes',
-                 'docker', 'ansible', 'chef', 'puppet'],
-        'tools': ['git', 'jenkins', 'github actions', 'gitlab ci', 'travis ci',
-                 'prometheus', 'grafana', 'elk', 'jenkins'],
-        'concepts': ['microservices', 'serverless', 'devops', 'cicd', 'tdd',
-                    'bdd', 'agile', 'scrum', 'kubernetes', 'docker']
-    }
-
     found_techs = {}
-    content_lower = content.lower()
-
-    for category, keywords in tech_keywords.items():
-        found = []
-        for keyword in keywords:
-            if keyword.lower() in content_lower:
-                found.append(keyword)
+    for category, category_keywords in TECH_KEYWORDS.items():
+        found = [keyword for keyword in category_keywords if keyword in keywords]
         if found:
             found_techs[category] = found
 
     return found_techs
 
 
+# 实用性评分中的布尔项: (字段, 分值)
+QUALITY_FLAG_WEIGHTS = (
+    ('has_introduction', 5),
+    ('has_examples', 10),
+    ('has_best_practices', 10),
+    ('has_troubleshooting', 5),
+    ('has_tools', 5),
+)
+CODE_FLAG_WEIGHTS = (
+    ('has_comments', 10),
+    ('has_error_handling', 5),
+)
+
+
 def calculate_utility_score(quality: Dict, code: Dict, tech: Dict) -> float:
     """计算实用性评分 (0-100)"""
-    score = 0
-
     # 内容质量 (40分)
-    if quality['has_introduction']:
-        score += 5
-    if quality['has_examples']:
-        score += 10
-    if quality['has_best_practices']:
-        score += 10
-    if quality['has_troubleshooting']:
-        score += 5
-    if quality['has_tools']:
-        score += 5
+    score = sum(weight for key, weight in QUALITY_FLAG_WEIGHTS if quality[key])
     score += min(quality['content_depth_score'] / 2, 5)  # 最多5分
 
     # 代码质量 (40分)
-    if code['code_blocks'] > 0:
-        score += 10
-        score += min(code['code_blocks'] * 2, 10)  # 最多10分
-    if code['has_comments']:
+    code_blocks = code['code_blocks']
+    if code_blocks > 0:
         score += 10
-    if code['has_error_handling']:
-        score += 5
+        score += min(code_blocks * 2, 10)  # 最多10分
+    for key, weight in CODE_FLAG_WEIGHTS:
+        if code[key]:
+            score += weight
     if code['total_code_lines'] > 100:
         score += 5
 
     # 技术覆盖 (20分)
-    tech_categories = len(tech)
-    score += min(tech_categories * 4, 20)  # 最多20分
+    score += min(len(tech) * 4, 20)  # 最多20分
 
     return min(score, 100)
 
@@ -201,51 +315,85 @@ def analyze_learning_path(skills: List[Dict]) -> Dict:
     return path_completion
 
 
-def analyze_skill(skill_dir: Path) -> Dict:
-    """深度分析单个技能"""
-    skill_md = skill_dir / "SKILL.md"
+def load_cached_analysis(cache_path: Path, cache_key: List) -> Dict:
+    """读取缓存的分析结果, 缓存键不匹配或缓存损坏时返回 None"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
 
-    if not skill_md.exists():
+    if not isinstance(cached, dict) or cached.get('key') != cache_key:
         return None
+    return cached.get('result')
+
+
+def store_cached_analysis(cache_path: Path, cache_key: List, result: Dict):
+    """写入分析结果缓存 (写入失败时忽略)"""
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': cache_key, 'result': result}, f, ensure_ascii=False, default=str)
+    except (OSError, TypeError, ValueError):
+        pass
 
-    with open(skill_md, 'r', encoding='utf-8') as f:
-        content = f.read()
 
-    # 解析 frontmatter
+def parse_simple_frontmatter(yaml_bytes: bytes) -> Dict:
+    """逐行按第一个冒号拆分 frontmatter, 用于无法按 YAML 解析的情况"""
     metadata = {}
-    in_frontmatter = False
-    yaml_lines = []
-
-    for line in content.split('\n'):
-        if line.strip() == '---':
-            if not in_frontmatter:
-                in_frontmatter = True
-            else:
-                break
-        elif in_frontmatter:
-            yaml_lines.append(line)
-
-    # 简单解析 YAML
-    for line in yaml_lines:
+    for line in yaml_bytes.decode('utf-8', errors='replace').split('\n'):
         if ':' in line:
             key, value = line.split(':', 1)
             metadata[key.strip()] = value.strip()
+    return metadata
 
-    # 提取 markdown 内容
-    markdown_start = content.find('---', 1)
-    if markdown_start != -1:
-        markdown_start = content.find('---', markdown_start + 3) + 3
-        markdown_content = content[markdown_start:]
-    else:
-        markdown_content = content
 
-    # 深度分析
-    code_analysis = analyze_code_examples(markdown_content)
-    quality_analysis = analyze_content_quality(markdown_content)
-    tech_analysis = analyze_technical_coverage(markdown_content)
+def analyze_skill(skill_dir: Path) -> Dict:
+    """深度分析单个技能"""
+    skill_md = skill_dir / "SKILL.md"
+
+    try:
+        stat = skill_md.stat()
+    except FileNotFoundError:
+        return None
+
+    # SKILL.md 未修改时直接复用上次的分析结果
+    cache_key = [CACHE_VERSION, stat.st_mtime_ns, stat.st_size]
+    cache_path = CACHE_DIR / f"{skill_dir.name}.json"
+    cached = load_cached_analysis(cache_path, cache_key)
+    if cached is not None:
+        return cached
+
+    # 按字节读取, 不对整个文件做 UTF-8 解码
+    content = skill_md.read_bytes()
+
+    # 拆分 frontmatter 和 markdown 内容
+    m = FRONTMATTER_PATTERN.match(content)
+    if m:
+        yaml_bytes, markdown_content = m.group(1), m.group(2)
+    else:
+        yaml_bytes, markdown_content = b'', content
+
+    # 解析 YAML; 不是合法 YAML 映射时 (如未加引号的 "description: Use when: ...")
+    # 退回逐行 key: value 拆分, 技能仍然参与分析
+    try:
+        metadata = yaml.safe_load(yaml_bytes.decode('utf-8')) or {}
+        error = None if isinstance(metadata, dict) else 'frontmatter 不是键值映射'
+    except (UnicodeDecodeError, yaml.YAMLError) as e:
+        error = getattr(e, 'problem', None) or str(e).replace('\n', ' ')
+    if error is not None:
+        metadata = parse_simple_frontmatter(yaml_bytes)
+
+    # 深度分析 (小写内容只生成一次, 结构扫描和关键词扫描的结果由各分析函数共享)
+    markdown_lower = markdown_content.lower()
+    scan = scan_markdown(markdown_content, markdown_lower)
+    keywords = find_keywords(markdown_lower)
+    code_analysis = analyze_code_examples(scan, keywords)
+    quality_analysis = analyze_content_quality(markdown_content, scan, keywords)
+    tech_analysis = analyze_technical_coverage(keywords)
     utility_score = calculate_utility_score(quality_analysis, code_analysis, tech_analysis)
 
-    return {
+    result = {
         'path': skill_dir.name,
         'metadata': metadata,
         'code_analysis': code_analysis,
@@ -253,6 +401,18 @@ def analyze_skill(skill_dir: Path) -> Dict:
         'tech_analysis': tech_analysis,
         'utility_score': utility_score
     }
+    if error is not None:
+        # 随结果一起缓存和写入报告, 复用缓存时同样会提示
+        result['frontmatter_error'] = error
+    store_cached_analysis(cache_path, cache_key, result)
+
+    return result
+
+
+# 报告中按技能计数的布尔项
+REPORT_QUALITY_FLAGS = ('has_introduction', 'has_examples', 'has_best_practices',
+                        'has_troubleshooting', 'has_tools', 'has_chinese')
+REPORT_CODE_FLAGS = ('has_comments', 'has_error_handling')
 
 
 def print_analysis_report(skills: List[Dict]):
@@ -266,18 +426,38 @@ def print_analysis_report(skills: List[Dict]):
     print("\n📊 总体统计:")
     print(f"   分析技能数: {len(skills)} 个")
 
-    avg_utility = sum(s['utility_score'] for s in skills) / len(skills)
+    # 单次遍历汇总所有统计项
+    totals = Counter()
+    flag_counts = Counter()
+    all_techs = {}
+    for skill in skills:
+        code = skill['code_analysis']
+        quality = skill['quality_analysis']
+        totals['utility_score'] += skill['utility_score']
+        totals['code_blocks'] += code['code_blocks']
+        totals['total_code_lines'] += code['total_code_lines']
+        totals['avg_code_lines_per_block'] += code['avg_code_lines_per_block']
+        for key in REPORT_QUALITY_FLAGS:
+            if quality[key]:
+                flag_counts[key] += 1
+        for key in REPORT_CODE_FLAGS:
+            if code[key]:
+                flag_counts[key] += 1
+        for category, techs in skill['tech_analysis'].items():
+            all_techs.setdefault(category, Counter()).update(techs)
+
+    avg_utility = totals['utility_score'] / len(skills)
     print(f"   平均实用性评分: {avg_utility:.1f}/100")
 
-    total_code_blocks = sum(s['code_analysis']['code_blocks'] for s in skills)
+    total_code_blocks = totals['code_blocks']
     print(f"   总代码块数: {total_code_blocks} 个")
 
-    total_code_lines = sum(s['code_analysis']['total_code_lines'] for s in skills)
+    total_code_lines = totals['total_code_lines']
     print(f"   总代码行数: {total_code_lines} 行")
 
     # 实用性排名
     print("\n🏆 实用性排名 (Top 10):")
-    sorted_skills = sorted(skills, key=lambda x: x['utility_score'], reverse=True)[:10]
+    sorted_skills = heapq.nlargest(10, skills, key=lambda x: x['utility_score'])
 
     for i, skill in enumerate(sorted_skills, 1):
         name = skill['metadata'].get('name', 'Unknown')
@@ -298,11 +478,11 @@ def print_analysis_report(skills: List[Dict]):
     # 内容质量分析
     print("📈 内容质量分析:")
 
-    has_intro = sum(1 for s in skills if s['quality_analysis']['has_introduction'])
-    has_examples = sum(1 for s in skills if s['quality_analysis']['has_examples'])
-    has_best_practices = sum(1 for s in skills if s['quality_analysis']['has_best_practices'])
-    has_troubleshooting = sum(1 for s in skills if s['quality_analysis']['has_troubleshooting'])
-    has_tools = sum(1 for s in skills if s['quality_analysis']['has_tools'])
+    has_intro = flag_counts['has_introduction']
+    has_examples = flag_counts['has_examples']
+    has_best_practices = flag_counts['has_best_practices']
+    has_troubleshooting = flag_counts['has_troubleshooting']
+    has_tools = flag_counts['has_tools']
 
     print(f"   ✅ 有介绍: {has_intro}/{len(skills)} ({has_intro*100//len(skills)}%)")
     print(f"   ✅ 有示例: {has_examples}/{len(skills)} ({has_examples*100//len(skills)}%)")
@@ -313,27 +493,18 @@ def print_analysis_report(skills: List[Dict]):
     # 代码质量分析
     print("\n💻 代码质量分析:")
 
-    has_comments = sum(1 for s in skills if s['code_analysis']['has_comments'])
-    has_error_handling = sum(1 for s in skills if s['code_analysis']['has_error_handling'])
+    has_comments = flag_counts['has_comments']
+    has_error_handling = flag_counts['has_error_handling']
 
     print(f"   ✅ 有注释: {has_comments}/{len(skills)} ({has_comments*100//len(skills)}%)")
     print(f"   ✅ 有错误处理: {has_error_handling}/{len(skills)} ({has_error_handling*100//len(skills)}%)")
 
-    avg_code_per_block = sum(s['code_analysis']['avg_code_lines_per_block']
-                            for s in skills) / len(skills)
+    avg_code_per_block = totals['avg_code_lines_per_block'] / len(skills)
     print(f"   📊 平均代码块大小: {avg_code_per_block:.1f} 行")
 
     # 技术覆盖分析
     print("\n🔧 技术覆盖分析:")
 
-    all_techs = {}
-    for skill in skills:
-        for category, techs in skill['tech_analysis'].items():
-            if category not in all_techs:
-                all_techs[category] = Counter()
-            for tech in techs:
-                all_techs[category][tech] += 1
-
     for category, techs in sorted(all_techs.items()):
         print(f"   {category}:")
         for tech, count in techs.most_common(5):
@@ -356,7 +527,7 @@ def print_analysis_report(skills: List[Dict]):
     # 语言支持分析
     print("\n🌐 语言支持分析:")
 
-    chinese_skills = sum(1 for s in skills if s['quality_analysis']['has_chinese'])
+    chinese_skills = flag_counts['has_chinese']
     english_skills = len(skills) - chinese_skills
 
     print(f"   中文技能: {chinese_skills} 个 ({chinese_skills*100//len(skills)}%)")
@@ -398,24 +569,31 @@ def main():
     print(f"📁 分析目录: {skills_dir}\n")
 
     # 分析所有技能
-    skills = []
-    for entry in skills_dir.iterdir():
-        if entry.is_dir():
-            skill = analyze_skill(entry)
-            if skill:
-                skills.append(skill)
+    skill_dirs = [entry for entry in skills_dir.iterdir() if entry.is_dir()]
+    with ProcessPoolExecutor() as executor:
+        skills = [skill for skill in executor.map(analyze_skill, skill_dirs, chunksize=4)
+                  if skill]
 
     if not skills:
         print("❌ 未找到任何 SKILL.md 文件")
         return 1
 
+    for skill in skills:
+        if 'frontmatter_error' in skill:
+            print(f"⚠️ {skill['path']}: frontmatter 解析失败 ({skill['frontmatter_error']}), "
+                  f"已按 key: value 逐行解析", file=sys.stderr)
+
     # 打印分析报告
     print_analysis_report(skills)
 
     # 保存详细分析结果
     report_path = Path("skill_analysis_report.json")
-    with open(report_path, 'w', encoding='utf-8') as f:
-        json.dump(skills, f, ensure_ascii=False, indent=2)
+    if orjson is not None:
+        report_path.write_bytes(
+            orjson.dumps(skills, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(skills, f, ensure_ascii=False, indent=2, default=str)
 
     print(f"📄 详细分析结果已保存到: {report_path}\n")
 
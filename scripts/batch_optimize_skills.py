@@ -5,103 +5,117 @@ Batch Skills Optimization Tool
 Quickly optimize multiple skills with best practices.
 """
 
+import logging
 import os
 import re
+import shutil
+import sys
+import yaml
 from pathlib import Path
 from typing import List, Dict
 
+log = logging.getLogger(__name__)
+
+FRONTMATTER_RE = re.compile(r'^---\n(.*?)\n---', re.DOTALL)
+
+TRIGGER_CHECK_PHRASES = ('use when', 'working with', 'user mentions', 'call when')
+
+TRIGGER_PHRASES = {
+    'backend': 'Use when working with APIs, databases, backend systems, or when the user mentions server-side development.',
+    'frontend': 'Use when working with UI components, web interfaces, or when the user mentions client-side development.',
+    'data': 'Use when working with data analysis, statistics, visualization, or when the user mentions data processing.',
+    'security': 'Use when working with security audits, vulnerability assessments, or when the user mentions security.',
+    'devops': 'Use when working with deployment, CI/CD, infrastructure, or when the user mentions operations.',
+}
+
+DEFAULT_ALLOWED_TOOLS = ['Read', 'Write', 'Edit', 'Grep', 'Bash']
+
+OPTIMIZED_VERSION = '2.0.0'
+
+# Frontmatter keys are checked in the first HEAD_BYTES of the file only
+HEAD_BYTES = 4096
+OPTIMIZED_VERSION_RE = re.compile(
+    rb'^version:[ \t]*([\'"]?)' + re.escape(OPTIMIZED_VERSION.encode()) + rb'\1[ \t]*$',
+    re.MULTILINE
+)
+ALLOWED_TOOLS_RE = re.compile(rb'^allowed_tools:', re.MULTILINE)
+
+def is_already_optimized(skill_path: Path) -> bool:
+    """Check the frontmatter in the file head for the current version and allowed_tools."""
+    fd = os.open(skill_path, os.O_RDONLY)
+    try:
+        head = os.pread(fd, HEAD_BYTES, 0)
+    finally:
+        os.close(fd)
+
+    # Only the frontmatter counts; keys in body examples must not match.
+    # A frontmatter not closed within the head is treated as not optimized.
+    if not head.startswith(b'---\n'):
+        return False
+    end = head.find(b'\n---', 3)
+    if end == -1:
+        return False
+    frontmatter = head[:end]
+    return (OPTIMIZED_VERSION_RE.search(frontmatter) is not None
+            and ALLOWED_TOOLS_RE.search(frontmatter) is not None)
+
 def optimize_skill_metadata(skill_path: Path) -> Dict:
     """Optimize a single skill's metadata."""
     with open(skill_path, 'r', encoding='utf-8') as f:
         content = f.read()
 
-    # Extract and optimize frontmatter
-    frontmatter_match = re.match(r'^(---\n.*?\n---)', content, re.DOTALL)
+    # Extract and parse frontmatter
+    frontmatter_match = FRONTMATTER_RE.match(content)
     if not frontmatter_match:
         return {'error': 'No frontmatter found'}
 
-    frontmatter = frontmatter_match.group(1)
+    try:
+        metadata = yaml.safe_load(frontmatter_match.group(1)) or {}
+    except yaml.YAMLError as e:
+        return {'error': f'YAML parsing error: {e}'}
+
     body_content = content[frontmatter_match.end():]
 
     # Extract name
-    name_match = re.search(r'name:\s*["\']([^"\']+)["\']', frontmatter)
-    if not name_match:
+    if not metadata.get('name'):
         return {'error': 'No name found'}
 
-    name = name_match.group(1)
+    name = str(metadata['name'])
 
     # Optimize name to lowercase
     optimized_name = name.lower().replace(' ', '-')
-    frontmatter = re.sub(
-        r'name:\s*["\'][^"\']+["\']',
-        f'name: "{optimized_name}"',
-        frontmatter
-    )
+    metadata['name'] = optimized_name
 
     # Extract description
-    desc_match = re.search(r'description:\s*["\']([^"\']+)["\']', frontmatter)
-    if not desc_match:
+    if not metadata.get('description'):
         return {'error': 'No description found'}
 
-    description = desc_match.group(1)
+    description = str(metadata['description'])
 
     # Check if description needs trigger words
     needs_triggers = not any(
         phrase in description.lower()
-        for phrase in ['use when', 'working with', 'user mentions', 'call when']
+        for phrase in TRIGGER_CHECK_PHRASES
     )
 
     if needs_triggers:
         # Add trigger words based on name
-        trigger_phrases = {
-            'backend': 'Use when working with APIs, databases, backend systems, or when the user mentions server-side development.',
-            'frontend': 'Use when working with UI components, web interfaces, or when the user mentions client-side development.',
-            'data': 'Use when working with data analysis, statistics, visualization, or when the user mentions data processing.',
-            'security': 'Use when working with security audits, vulnerability assessments, or when the user mentions security.',
-            'devops': 'Use when working with deployment, CI/CD, infrastructure, or when the user mentions operations.',
-        }
-
-        for key, trigger in trigger_phrases.items():
+        for key, trigger in TRIGGER_PHRASES.items():
             if key in optimized_name:
                 description = f"{description} {trigger}"
                 break
 
-    frontmatter = re.sub(
-        r'description:\s*["\'][^"\']+["\']',
-        f'description: "{description}"',
-        frontmatter
-    )
+    metadata['description'] = description
 
     # Add allowed-tools if missing
-    if 'allowed_tools:' not in frontmatter:
-        # Insert after dependencies or tags
-        if 'dependencies:' in frontmatter:
-            insert_pos = frontmatter.find('dependencies:')
-        elif 'tags:' in frontmatter:
-            insert_pos = frontmatter.find('tags:')
-        else:
-            insert_pos = frontmatter.find('\n', frontmatter.find('version:'))
-
-        if insert_pos != -1:
-            # Find the end of the section
-            section_end = frontmatter.find('\n\n', insert_pos)
-            if section_end == -1:
-                section_end = len(frontmatter)
+    metadata.setdefault('allowed_tools', list(DEFAULT_ALLOWED_TOOLS))
 
-            # Determine appropriate tools based on skill name
-            tools = ['Read', 'Write', 'Edit', 'Grep', 'Bash']
+    # Update version (added when missing, since verify_skills requires it)
+    metadata['version'] = OPTIMIZED_VERSION
 
-            tools_section = f'\nallowed_tools:\n'
-            tools_section += '\n'.join(f'  - {tool}' for tool in tools)
-
-            frontmatter = frontmatter[:section_end] + tools_section + frontmatter[section_end:]
-
-    # Update version
-    frontmatter = re.sub(
-        r'version:\s*["\']?[\d.]+"?\n',
-        'version: "2.0.0"\n',
-        frontmatter
-    )
+    frontmatter = '---\n' + yaml.safe_dump(
+        metadata, sort_keys=False, allow_unicode=True, width=float('inf')
+    ) + '---'
 
     return {
         'name': optimized_name,
@@ -119,12 +133,34 @@ def create_optimized_skill(skill_path: Path, optimization: Dict) -> bool:
 
     new_content = optimization['frontmatter'] + '\n' + optimization['body']
 
-    # Backup original
     backup_path = skill_path.with_suffix('.md.backup')
-    skill_path.rename(backup_path)
-
-    # Write optimized
-    skill_path.write_text(new_content, encoding='utf-8')
+    tmp_path = skill_path.with_suffix('.md.tmp')
+
+    try:
+        # Write optimized content to a temp file first, so an interrupted
+        # run never leaves the skill without a SKILL.md
+        mode = os.stat(skill_path).st_mode & 0o777
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(new_content.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Backup original as a hard link (or a copy) while SKILL.md stays
+        # in place, then swap the optimized file in with a single rename
+        try:
+            os.unlink(backup_path)
+        except FileNotFoundError:
+            pass
+        try:
+            os.link(skill_path, backup_path)
+        except OSError:
+            shutil.copy2(skill_path, backup_path)
+        os.replace(tmp_path, skill_path)
+    except OSError:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return False
 
     return True
 
@@ -133,42 +169,49 @@ def optimize_all_skills(skills_dir: Path, dry_run: bool = False) -> List[Dict]:
     results = []
 
     for skill_file in sorted(skills_dir.glob("*/SKILL.md")):
-        print(f"\nProcessing: {skill_file.parent.name}")
+        skill_name = skill_file.parent.name
+
+        if is_already_optimized(skill_file):
+            log.info("⏭️  %s: already at version %s", skill_name, OPTIMIZED_VERSION)
+            results.append({
+                'skill': skill_name,
+                'status': 'up_to_date'
+            })
+            continue
 
         optimization = optimize_skill_metadata(skill_file)
 
         if 'error' in optimization:
-            print(f"  ❌ Error: {optimization['error']}")
+            log.info("❌ %s: %s", skill_name, optimization['error'])
             results.append({
-                'skill': skill_file.parent.name,
+                'skill': skill_name,
                 'status': 'error',
                 'error': optimization['error']
             })
             continue
 
-        print(f"  Name: {optimization['original_name']} → {optimization['name']}")
-        print(f"  Description: {optimization['description'][:80]}...")
-
         if not dry_run:
             success = create_optimized_skill(skill_file, optimization)
             if success:
-                print(f"  ✅ Optimized (backup created)")
+                log.info("✅ %s: %s → %s (backup created)", skill_name,
+                         optimization['original_name'], optimization['name'])
                 results.append({
-                    'skill': skill_file.parent.name,
+                    'skill': skill_name,
                     'status': 'optimized',
                     'original_name': optimization['original_name'],
                     'new_name': optimization['name']
                 })
             else:
-                print(f"  ❌ Failed to write")
+                log.info("❌ %s: failed to write", skill_name)
                 results.append({
-                    'skill': skill_file.parent.name,
+                    'skill': skill_name,
                     'status': 'write_failed'
                 })
         else:
-            print(f"  📝 Would optimize (dry run)")
+            log.info("📝 %s: %s → %s (dry run)", skill_name,
+                     optimization['original_name'], optimization['name'])
             results.append({
-                'skill': skill_file.parent.name,
+                'skill': skill_name,
                 'status': 'dry_run',
                 'original_name': optimization['original_name'],
                 'new_name': optimization['name']
@@ -197,8 +240,13 @@ def main():
         print(f"Error: Skills directory not found: {skills_dir}")
         return 1
 
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('  %(message)s'))
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+
     print(f"Optimizing skills in: {skills_dir}")
-    print(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE'}")
+    print(f"Mode: {'DRY RUN' if args.dry_run else 'LIVE'}\n")
 
     results = optimize_all_skills(skills_dir, dry_run=args.dry_run)
 
@@ -209,9 +257,11 @@ def main():
 
     optimized = sum(1 for r in results if r['status'] in ['optimized', 'dry_run'])
     errors = sum(1 for r in results if r['status'] in ['error', 'write_failed'])
+    up_to_date = sum(1 for r in results if r['status'] == 'up_to_date')
 
     print(f"Total skills: {len(results)}")
     print(f"Would optimize: {optimized}")
+    print(f"Already up to date: {up_to_date}")
     print(f"Errors: {errors}")
 
     if not args.dry_run and optimized > 0:
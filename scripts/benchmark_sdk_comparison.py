@@ -5,178 +5,343 @@ Claude Agent SDK跨语言性能对比测试工具
 支持测试Rust、Python和Node.js SDK的性能，并生成对比报告。
 """
 
+import argparse
 import asyncio
+import io
 import json
+import os
 import subprocess
+import sys
+import tempfile
 import time
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from functools import partial
+from typing import IO, Awaitable, Callable, Dict, List, Optional
 from pathlib import Path
-import statistics
 
+from _bench_stats import BenchmarkResult, compute_stats
 
-@dataclass
-class BenchmarkResult:
-    """基准测试结果"""
-    name: str
-    mean_ms: float
-    median_ms: float
-    p95_ms: float
-    p99_ms: float
-    min_ms: float
-    max_ms: float
-    std_dev_ms: float
-    samples: int
+
+# Node.js常驻进程: 从stdin逐行读取prompt, 每行输出一个JSON结果
+NODEJS_WORKER_SCRIPT = """
+const readline = require('readline');
+const anthropic = require('@anthropic-ai/sdk');
+const client = new anthropic.Anthropic();
+
+async function main() {
+    const rl = readline.createInterface({ input: process.stdin });
+    for await (const prompt of rl) {
+        const start = Date.now();
+        try {
+            await client.messages.create({
+                model: 'claude-sonnet-4-5',
+                max_tokens: 1024,
+                messages: [{ role: 'user', content: prompt }]
+            });
+            console.log(JSON.stringify({ elapsed_ms: Date.now() - start }));
+        } catch (e) {
+            console.log(JSON.stringify({ error: String(e) }));
+        }
+    }
+}
+
+main();
+"""
+
+
+# main()中同时测试的SDK数量上限
+MAX_PARALLEL_SDKS = 2
+
+# Rust SDK测试使用的常驻benchmark示例
+RUST_EXAMPLE = "70_benchmark_server"
+
+# 迭代进度行: SDK, 已完成次数, 总次数, 本次耗时
+PROGRESS_TEMPLATE = "  [{}] 迭代 {}/{}: {:.1f}ms"
 
 
 class SDKBenchmark:
     """SDK基准测试器"""
 
-    def __init__(self, iterations: int = 50, timeout: int = 30, delay: float = 2.0):
+    def __init__(self, iterations: int = 50, timeout: int = 30, delay: float = 2.0,
+                 concurrency: int = 1):
         self.iterations = iterations
         self.timeout = timeout
         self.delay = delay
-
-    def _run_rust_example(self, example_name: str, prompt: str) -> float:
-        """运行Rust示例并测量时间"""
-        start = time.perf_counter()
-        try:
+        self.concurrency = concurrency
+        # 逐次迭代的进度只在终端上显示, 且最多显示约20次
+        self._show_progress = sys.stdout.isatty()
+        self._progress_every = max(1, iterations // 20)
+        # 常驻的benchmark进程, 按名称复用 (Rust按示例名, Node.js为"nodejs")
+        self._workers: Dict[str, asyncio.subprocess.Process] = {}
+        self._stderr_logs: Dict[str, IO[bytes]] = {}
+        # 已编译的Rust示例路径, 编译失败时为None
+        self._rust_bins: Dict[str, Optional[Path]] = {}
+        # Python SDK client, 首次使用时创建, 所有场景和迭代共享同一个连接池
+        self._anthropic = None
+        # 仓库根目录 (cargo工作目录) 和已编码的prompt行, 只计算一次
+        self._repo_root = Path(__file__).resolve().parent.parent
+        self._prompt_lines: Dict[str, bytes] = {}
+
+    def _log(self, message: str):
+        """输出一行 (所有SDK在同一个事件循环中运行, 每次print都是完整的一行)"""
+        print(message, flush=True)
+
+    def prepare_rust_example(self, example_name: str) -> bool:
+        """预先编译Rust示例 (每个示例只编译一次), 返回编译产物是否可用"""
+        if example_name not in self._rust_bins:
+            root = self._repo_root
             result = subprocess.run(
-                ["cargo", "run", "--release", "--example", example_name],
-                input=prompt.encode(),
-                capture_output=True,
-                timeout=self.timeout,
-                cwd=Path(__file__).parent.parent
+                ["cargo", "build", "--release", "--example", example_name],
+                cwd=root
             )
-            if result.returncode != 0:
-                print(f"Rust error: {result.stderr.decode()}")
-                return -1
-        except subprocess.TimeoutExpired:
-            return -1
-        return (time.perf_counter() - start) * 1000  # 转换为毫秒
-
-    def _run_python_sdk(self, prompt: str) -> float:
-        """运行Python SDK并测量时间"""
+            target_dir = Path(os.environ.get("CARGO_TARGET_DIR", root / "target"))
+            binary = target_dir / "release" / "examples" / example_name
+            if result.returncode != 0 or not binary.exists():
+                self._log(f"Rust示例 {example_name} 编译失败或找不到 {binary}")
+                binary = None
+            self._rust_bins[example_name] = binary
+        return self._rust_bins[example_name] is not None
+
+    def _progress(self, label: str, done: int, elapsed: float):
+        """输出迭代进度 (非终端输出时跳过)"""
+        if not self._show_progress:
+            return
+        if done % self._progress_every and done != self.iterations:
+            return
+        self._log(PROGRESS_TEMPLATE.format(label, done, self.iterations, elapsed))
+
+    async def _start_rust_worker(self, example_name: str) -> asyncio.subprocess.Process:
+        """直接启动已编译的Rust示例作为常驻进程, 不经过cargo"""
+        if not self.prepare_rust_example(example_name):
+            raise RuntimeError(f"Rust示例 {example_name} 不可用")
+        binary = self._rust_bins[example_name]
+        return await self._spawn_worker(example_name, [str(binary)], cwd=self._repo_root)
+
+    async def _start_nodejs_worker(self) -> asyncio.subprocess.Process:
+        """启动常驻的Node.js进程, 所有迭代共用一个client"""
+        return await self._spawn_worker("nodejs", ["node", "-e", NODEJS_WORKER_SCRIPT])
+
+    async def _spawn_worker(self, name: str, args: List[str],
+                            cwd: Optional[Path] = None) -> asyncio.subprocess.Process:
+        """启动常驻进程: 结果走stdout管道, stderr直接写入临时文件
+
+        stderr不经过Python读取, 只在进程异常退出时才读取末尾用于报错。
+        """
+        stderr_log = tempfile.TemporaryFile()
+        self._stderr_logs[name] = stderr_log
         try:
-            from anthropic import Anthropic
-            client = Anthropic()
-
-            start = time.perf_counter()
-            client.messages.create(
-                model="claude-sonnet-4-5",
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}]
+            return await asyncio.create_subprocess_exec(
+                *args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=stderr_log,
+                cwd=cwd
             )
-            return (time.perf_counter() - start) * 1000
-        except Exception as e:
-            print(f"Python error: {e}")
-            return -1
-
-    def _run_nodejs_sdk(self, prompt: str) -> float:
-        """运行Node.js SDK并测量时间"""
-        script = """
-const anthropic = require('@anthropic-ai/sdk');
-const client = new anthropic.Anthropic();
-
-async function query(prompt) {
-    const start = Date.now();
-    await client.messages.create({
-        model: 'claude-sonnet-4-5',
-        max_tokens: 1024,
-        messages: [{ role: 'user', content: prompt }]
-    });
-    return Date.now() - start;
-}
+        except BaseException:
+            # 进程未能启动, 没有人会再关闭这个临时文件
+            del self._stderr_logs[name]
+            stderr_log.close()
+            raise
+
+    def _stderr_tail(self, name: str, limit: int = 2000) -> str:
+        """读取常驻进程stderr的末尾部分"""
+        stderr_log = self._stderr_logs.get(name)
+        if stderr_log is None:
+            return ""
+        size = stderr_log.seek(0, os.SEEK_END)
+        stderr_log.seek(max(0, size - limit))
+        return stderr_log.read().decode(errors="replace").strip()
+
+    async def _stop_worker(self, name: str):
+        """关闭常驻进程"""
+        proc = self._workers.pop(name, None)
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            await proc.stdin.wait_closed()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # 进程已退出, 缓冲中未写出的prompt直接丢弃
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+        stderr_log = self._stderr_logs.pop(name, None)
+        if stderr_log is not None:
+            stderr_log.close()
+
+    async def aclose(self):
+        """关闭Python SDK client和所有常驻进程"""
+        if self._anthropic is not None:
+            await self._anthropic.close()
+            self._anthropic = None
+        for name in list(self._workers):
+            await self._stop_worker(name)
+
+    def _python_client(self):
+        """返回共享的AsyncAnthropic client"""
+        if self._anthropic is None:
+            from anthropic import AsyncAnthropic
+            self._anthropic = AsyncAnthropic()
+        return self._anthropic
+
+    async def _query_worker(self, name: str, start_worker, prompt: str, label: str) -> float:
+        """向常驻进程发送一次查询并返回其报告的耗时"""
+        proc = self._workers.get(name)
+        if proc is None or proc.returncode is not None:
+            proc = await start_worker()
+            self._workers[name] = proc
+
+        # 每行一个prompt, 每行一个JSON响应
+        request = self._prompt_lines.get(prompt)
+        if request is None:
+            request = self._prompt_lines[prompt] = (prompt.replace("\n", " ") + "\n").encode()
+        try:
+            proc.stdin.write(request)
+            await proc.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            return await self._worker_exited(name, proc, label)
 
-query(process.argv[2]).then(time => console.log(time));
-"""
-        start = time.perf_counter()
         try:
-            result = subprocess.run(
-                ["node", "-e", script, prompt],
-                capture_output=True,
-                timeout=self.timeout
-            )
-            if result.returncode != 0:
-                print(f"Node.js error: {result.stderr.decode()}")
-                return -1
-            return float(result.stdout.decode().strip())
-        except subprocess.TimeoutExpired:
+            response = await asyncio.wait_for(self._read_response(proc), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            # 超时的进程状态未知, 丢弃后下次重新启动
+            proc.kill()
+            await self._stop_worker(name)
             return -1
-        except ValueError:
+
+        if response is None:
+            return await self._worker_exited(name, proc, label)
+        if isinstance(response, bytes):
+            self._log(f"{label} error: 无法解析的响应: {response.decode(errors='replace').strip()}")
+            return -1
+        if "error" in response:
+            self._log(f"{label} error: {response['error']}")
             return -1
-        return (time.perf_counter() - start) * 1000
+        return response["elapsed_ms"]
+
+    async def _read_response(self, proc: asyncio.subprocess.Process):
+        """读取一次查询的响应, 跳过查询进行中的keepalive行
+
+        返回解析后的JSON; 进程退出时返回None, 无法解析时返回原始行。
+        """
+        while True:
+            line = await proc.stdout.readline()
+            if not line:
+                return None
+            try:
+                response = json.loads(line)
+            except ValueError:
+                return line
+            if not response.get("keepalive"):
+                return response
+
+    async def _worker_exited(self, name: str, proc: asyncio.subprocess.Process, label: str) -> float:
+        """常驻进程意外退出: 报告其stderr末尾并清理, 下次调用时重新启动"""
+        await proc.wait()
+        message = f"{label} error: benchmark进程已退出 (退出码 {proc.returncode})"
+        stderr_tail = self._stderr_tail(name)
+        if stderr_tail:
+            message += "\n" + stderr_tail
+        self._log(message)
+        await self._stop_worker(name)
+        return -1
+
+    async def _run_rust_example(self, example_name: str, prompt: str) -> float:
+        """通过常驻的Rust进程运行一次查询并返回其耗时"""
+        return await self._query_worker(
+            example_name, lambda: self._start_rust_worker(example_name), prompt, "Rust"
+        )
 
-    def benchmark_rust(self, prompt: str, example: str = "01_hello_world") -> BenchmarkResult:
-        """运行Rust SDK基准测试"""
-        print(f"运行Rust SDK测试 ({self.iterations}次迭代)...")
+    async def query_rust(self, prompt: str, example: str = RUST_EXAMPLE) -> float:
+        """通过常驻的Rust进程运行一次查询, 返回耗时ms (失败或超时时为-1)"""
+        return await self._run_rust_example(example, prompt)
+
+    async def _run_python_sdk(self, client, prompt: str, sem: asyncio.Semaphore, index: int) -> float:
+        """运行第index次Python SDK查询并测量单次请求耗时"""
+        async with sem:
+            try:
+                start = time.perf_counter()
+                await asyncio.wait_for(client.messages.create(
+                    model="claude-sonnet-4-5",
+                    max_tokens=1024,
+                    messages=[{"role": "user", "content": prompt}]
+                ), timeout=self.timeout)
+                elapsed = (time.perf_counter() - start) * 1000
+            except asyncio.TimeoutError:
+                self._log(f"Python error: 请求超过{self.timeout}秒未完成")
+                elapsed = -1
+            except Exception as e:
+                self._log(f"Python error: {e}")
+                elapsed = -1
+            # 在并发槽内延迟, 使同一槽位的请求保持间隔, 避免API限流;
+            # 槽位上没有后续请求时 (最后concurrency次) 不延迟
+            if self.delay and index < self.iterations - self.concurrency:
+                await asyncio.sleep(self.delay)
+            return elapsed
+
+    async def _run_nodejs_sdk(self, prompt: str) -> float:
+        """通过常驻的Node.js进程运行一次查询并返回其耗时"""
+        return await self._query_worker("nodejs", self._start_nodejs_worker, prompt, "Node.js")
+
+    async def _benchmark_loop(self, label: str, run_one: Callable[[str], Awaitable[float]],
+                              prompt: str) -> BenchmarkResult:
+        """串行运行iterations次run_one, 输出进度并计算统计数据"""
+        self._log(f"运行{label} SDK测试 ({self.iterations}次迭代)...")
         times: List[float] = []
 
         for i in range(self.iterations):
-            elapsed = self._run_rust_example(example, prompt)
+            elapsed = await run_one(prompt)
             if elapsed > 0:
                 times.append(elapsed)
-            print(f"  迭代 {i+1}/{self.iterations}: {elapsed:.1f}ms", end='\r')
+            self._progress(label, i + 1, elapsed)
             if i < self.iterations - 1:  # 最后一次迭代不延迟
-                time.sleep(self.delay)
+                await asyncio.sleep(self.delay)
 
+        return self._summarize(label, times)
+
+    def _summarize(self, label: str, times: List[float]) -> BenchmarkResult:
+        """计算一个SDK的统计数据, 没有成功的迭代时报错"""
         if not times:
-            raise RuntimeError("Rust SDK测试失败: 所有迭代都超时或出错")
+            raise RuntimeError(f"{label} SDK测试失败: 所有迭代都超时或出错")
 
-        return self._calculate_statistics("Rust SDK", times)
+        return self._calculate_statistics(f"{label} SDK", times)
 
-    def benchmark_python(self, prompt: str) -> BenchmarkResult:
-        """运行Python SDK基准测试"""
-        print(f"运行Python SDK测试 ({self.iterations}次迭代)...")
-        times: List[float] = []
+    async def benchmark_rust(self, prompt: str, example: str = RUST_EXAMPLE) -> BenchmarkResult:
+        """运行Rust SDK基准测试"""
+        return await self._benchmark_loop("Rust", partial(self._run_rust_example, example), prompt)
 
-        for i in range(self.iterations):
-            elapsed = self._run_python_sdk(prompt)
-            if elapsed > 0:
-                times.append(elapsed)
-            print(f"  迭代 {i+1}/{self.iterations}: {elapsed:.1f}ms", end='\r')
-            if i < self.iterations - 1:  # 最后一次迭代不延迟
-                time.sleep(self.delay)
+    async def benchmark_python(self, prompt: str) -> BenchmarkResult:
+        """运行Python SDK基准测试 (最多concurrency个请求同时进行)"""
+        self._log(f"运行Python SDK测试 ({self.iterations}次迭代, 并发{self.concurrency})...")
+        client = self._python_client()
+        sem = asyncio.Semaphore(self.concurrency)
 
-        if not times:
-            raise RuntimeError("Python SDK测试失败: 所有迭代都超时或出错")
+        # 记录每个请求自身的延迟而不是总耗时, 统计口径不变
+        results = await asyncio.gather(*[
+            self._run_python_sdk(client, prompt, sem, i) for i in range(self.iterations)
+        ])
+        times: List[float] = [elapsed for elapsed in results if elapsed > 0]
+        self._log(f"  [Python] 完成 {len(times)}/{self.iterations} 次迭代")
 
-        return self._calculate_statistics("Python SDK", times)
+        return self._summarize("Python", times)
 
-    def benchmark_nodejs(self, prompt: str) -> BenchmarkResult:
+    async def benchmark_nodejs(self, prompt: str) -> BenchmarkResult:
         """运行Node.js SDK基准测试"""
-        print(f"运行Node.js SDK测试 ({self.iterations}次迭代)...")
-        times: List[float] = []
-
-        for i in range(self.iterations):
-            elapsed = self._run_nodejs_sdk(prompt)
-            if elapsed > 0:
-                times.append(elapsed)
-            print(f"  迭代 {i+1}/{self.iterations}: {elapsed:.1f}ms", end='\r')
-            if i < self.iterations - 1:  # 最后一次迭代不延迟
-                time.sleep(self.delay)
-
-        if not times:
-            raise RuntimeError("Node.js SDK测试失败: 所有迭代都超时或出错")
+        return await self._benchmark_loop("Node.js", self._run_nodejs_sdk, prompt)
 
-        return self._calculate_statistics("Node.js SDK", times)
+    async def run_guarded(self, limit: asyncio.Semaphore, sdk_name: str, runner):
+        """在并发上限内运行单个SDK的测试, 失败时结果为None"""
+        async with limit:
+            try:
+                return sdk_name, await runner()
+            except Exception as e:
+                self._log(f"{sdk_name} SDK测试失败: {e}")
+                return sdk_name, None
 
     def _calculate_statistics(self, name: str, times: List[float]) -> BenchmarkResult:
         """计算统计数据"""
-        sorted_times = sorted(times)
-        n = len(times)
-
-        return BenchmarkResult(
-            name=name,
-            mean_ms=statistics.mean(times),
-            median_ms=statistics.median(times),
-            p95_ms=sorted_times[int(n * 0.95)] if n >= 20 else max(times),
-            p99_ms=sorted_times[int(n * 0.99)] if n >= 100 else max(times),
-            min_ms=min(times),
-            max_ms=max(times),
-            std_dev_ms=statistics.stdev(times) if n > 1 else 0,
-            samples=n
-        )
+        return compute_stats(times, name)
 
     def print_comparison_table(self, results: Dict[str, BenchmarkResult]):
         """打印对比表格"""
@@ -185,7 +350,7 @@ query(process.argv[2]).then(time => console.log(time));
         print("="*100)
 
         # 打印表头
-        print(f"{'场景':<20} {'SDK':<15} {'平均':<10} {'中位数':<10} {'P95':<10} {'P99':<10} {'标准差':<10}")
+        print(f"{'场景':<20} {'SDK':<15} {'平均':<10} {'±95%CI':<10} {'中位数':<10} {'P95':<10} {'P99':<10} {'标准差':<10}")
         print("-" * 100)
 
         # 打印每个场景的结果
@@ -193,6 +358,7 @@ query(process.argv[2]).then(time => console.log(time));
             for sdk_name, result in results_dict.items():
                 print(f"{scenario:<20} {sdk_name:<15} "
                       f"{result.mean_ms:<10.1f} "
+                      f"{result.ci95_ms:<10.1f} "
                       f"{result.median_ms:<10.1f} "
                       f"{result.p95_ms:<10.1f} "
                       f"{result.p99_ms:<10.1f} "
@@ -201,79 +367,94 @@ query(process.argv[2]).then(time => console.log(time));
 
     def generate_markdown_report(self, results: Dict[str, BenchmarkResult], output_path: str = "benchmark_results.md"):
         """生成Markdown格式的报告"""
-        report = []
-        report.append("# Claude Agent SDK 性能对比报告\n")
-        report.append(f"**生成时间**: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-        report.append(f"**测试配置**: 每个SDK {self.iterations} 次迭代\n")
+        buf = io.StringIO()
+        write = buf.write
+        write(
+            "# Claude Agent SDK 性能对比报告\n\n"
+            f"**生成时间**: {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            f"**测试配置**: 每个SDK {self.iterations} 次迭代\n\n"
+        )
 
         # 概览表格
-        report.append("## 性能概览\n")
-        report.append("| 场景 | SDK | 平均 (ms) | 中位数 (ms) | P95 (ms) | P99 (ms) | 标准差 (ms) |")
-        report.append("|------|-----|-----------|-------------|----------|----------|-------------|")
+        write(
+            "## 性能概览\n\n"
+            "| 场景 | SDK | 平均 (ms) | ±95%CI (ms) | 中位数 (ms) | P95 (ms) | P99 (ms) | 标准差 (ms) |\n"
+            "|------|-----|-----------|-------------|-------------|----------|----------|-------------|\n"
+        )
 
         for scenario, results_dict in results.items():
             for sdk_name, result in results_dict.items():
-                report.append(
+                write(
                     f"| {scenario} | {sdk_name} | "
                     f"{result.mean_ms:.1f} | "
+                    f"{result.ci95_ms:.1f} | "
                     f"{result.median_ms:.1f} | "
                     f"{result.p95_ms:.1f} | "
                     f"{result.p99_ms:.1f} | "
-                    f"{result.std_dev_ms:.1f} |"
+                    f"{result.std_dev_ms:.1f} |\n"
                 )
 
         # 详细分析
-        report.append("\n## 详细分析\n")
+        write("\n## 详细分析\n\n")
 
         for scenario, results_dict in results.items():
+            write(f"### {scenario}\n\n")
             if not results_dict:
-                report.append(f"### {scenario}\n")
-                report.append("⚠️ 所有SDK测试均失败，无数据\n")
+                write("⚠️ 所有SDK测试均失败，无数据\n\n")
                 continue
 
-            report.append(f"### {scenario}\n")
-
             # 找出最快的SDK
             fastest = min(results_dict.values(), key=lambda r: r.mean_ms)
 
             for sdk_name, result in results_dict.items():
                 speedup = result.mean_ms / fastest.mean_ms
-                report.append(f"#### {sdk_name}\n")
-                report.append(f"- 平均延迟: **{result.mean_ms:.1f}ms**")
-                report.append(f"- 相对性能: {speedup:.2f}x " +
-                             ("(最快) 🚀" if speedup == 1.0 else f"({speedup:.2f}x 慢)"))
-                report.append(f"- 延迟范围: {result.min_ms:.1f}ms - {result.max_ms:.1f}ms")
-                report.append(f"- 标准差: {result.std_dev_ms:.1f}ms ({(result.std_dev_ms/result.mean_ms*100):.1f}% 变异系数)")
-                report.append("")
+                relative = "(最快) 🚀" if speedup == 1.0 else f"({speedup:.2f}x 慢)"
+                write(
+                    f"#### {sdk_name}\n\n"
+                    f"- 平均延迟: **{result.mean_ms:.1f}ms** (±{result.ci95_ms:.1f}ms, 95%置信区间, {result.samples}个样本)\n"
+                    f"- 相对性能: {speedup:.2f}x {relative}\n"
+                    f"- 延迟范围: {result.min_ms:.1f}ms - {result.max_ms:.1f}ms\n"
+                    f"- 标准差: {result.std_dev_ms:.1f}ms ({(result.std_dev_ms/result.mean_ms*100):.1f}% 变异系数)\n"
+                    "\n"
+                )
 
         # 建议
-        report.append("## 性能建议\n")
+        write("## 性能建议\n\n")
 
         for scenario, results_dict in results.items():
+            write(f"### {scenario}\n\n")
             if not results_dict:
-                report.append(f"### {scenario}\n")
-                report.append("⚠️ 无数据，无法生成建议\n")
+                write("⚠️ 无数据，无法生成建议\n\n")
                 continue
 
-            report.append(f"### {scenario}\n")
             fastest_sdk = min(results_dict.items(), key=lambda x: x[1].mean_ms)
-            report.append(f"- **推荐**: {fastest_sdk[0]} ({fastest_sdk[1].mean_ms:.1f}ms 平均延迟)")
-            report.append(f"- **最慢**: {max(results_dict.items(), key=lambda x: x[1].mean_ms)[0]}")
+            slowest_sdk = max(results_dict.items(), key=lambda x: x[1].mean_ms)
 
             # 性能差异分析
             speeds = [r.mean_ms for r in results_dict.values()]
             variation = (max(speeds) - min(speeds)) / min(speeds) * 100
-            report.append(f"- **性能差异**: {variation:.1f}%")
-            report.append("")
+            write(
+                f"- **推荐**: {fastest_sdk[0]} ({fastest_sdk[1].mean_ms:.1f}ms 平均延迟)\n"
+                f"- **最慢**: {slowest_sdk[0]}\n"
+                f"- **性能差异**: {variation:.1f}%\n"
+                "\n"
+            )
 
         # 写入文件
         output_file = Path(output_path)
-        output_file.write_text("\n".join(report), encoding='utf-8')
+        output_file.write_text(buf.getvalue(), encoding='utf-8')
         print(f"\n报告已生成: {output_file.absolute()}")
 
 
 async def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="Claude Agent SDK 性能对比测试")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Python SDK同时进行的请求数 (默认1, 即逐个请求)")
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency 必须大于等于1")
+
     print("Claude Agent SDK 性能对比测试")
     print("=" * 50)
 
@@ -284,36 +465,39 @@ async def main():
         "代码生成": "Write a function to calculate fibonacci numbers in Python",
     }
 
-    benchmark = SDKBenchmark(iterations=2, timeout=60, delay=3.0)
+    benchmark = SDKBenchmark(iterations=2, timeout=60, delay=3.0, concurrency=args.concurrency)
     all_results = {}
-
-    for scenario_name, prompt in test_scenarios.items():
-        print(f"\n{'='*50}")
-        print(f"测试场景: {scenario_name}")
-        print(f"Prompt: {prompt[:50]}...")
-        print(f"{'='*50}\n")
-
-        scenario_results = {}
-
-        # 测试每个SDK
-        try:
-            scenario_results["Rust"] = benchmark.benchmark_rust(prompt, "01_hello_world")
-            time.sleep(2)  # SDK之间延迟，避免API限流
-        except Exception as e:
-            print(f"Rust SDK测试失败: {e}")
-
-        try:
-            scenario_results["Python"] = benchmark.benchmark_python(prompt)
-            time.sleep(2)  # SDK之间延迟，避免API限流
-        except Exception as e:
-            print(f"Python SDK测试失败: {e}")
-
-        try:
-            scenario_results["Node.js"] = benchmark.benchmark_nodejs(prompt)
-        except Exception as e:
-            print(f"Node.js SDK测试失败: {e}")
-
-        all_results[scenario_name] = scenario_results
+    # 同时最多两个SDK在测试, 避免API限流
+    sdk_limit = asyncio.Semaphore(MAX_PARALLEL_SDKS)
+
+    # 在所有场景之前编译一次Rust示例, 不可用时跳过Rust测试
+    rust_available = benchmark.prepare_rust_example(RUST_EXAMPLE)
+    if not rust_available:
+        print("⚠️ Rust示例不可用, 跳过所有场景的Rust SDK测试")
+
+    try:
+        for scenario_name, prompt in test_scenarios.items():
+            print(f"\n{'='*50}")
+            print(f"测试场景: {scenario_name}")
+            print(f"Prompt: {prompt[:50]}...")
+            print(f"{'='*50}\n")
+
+            # 各SDK相互独立, 在同一个事件循环中并行测试
+            runners = {}
+            if rust_available:
+                runners["Rust"] = lambda: benchmark.benchmark_rust(prompt, RUST_EXAMPLE)
+            runners["Python"] = lambda: benchmark.benchmark_python(prompt)
+            runners["Node.js"] = lambda: benchmark.benchmark_nodejs(prompt)
+            results = await asyncio.gather(*(
+                benchmark.run_guarded(sdk_limit, sdk_name, runner) for sdk_name, runner in runners.items()
+            ))
+
+            all_results[scenario_name] = {
+                sdk_name: result for sdk_name, result in results if result is not None
+            }
+    finally:
+        # 中途出错或被中断时也要关闭常驻进程
+        await benchmark.aclose()
 
     # 打印结果
     benchmark.print_comparison_table(all_results)
@@ -4,7 +4,8 @@
 """
 import subprocess
 import time
-import statistics
+
+from _bench_stats import compute_stats
 
 def run_test(iterations=5):
     """运行多次测试"""
@@ -40,16 +41,14 @@ def run_test(iterations=5):
     print("📊 统计分析")
     print("=" * 70)
 
-    sorted_times = sorted(times)
-    n = len(times)
-
-    mean = statistics.mean(times)
-    median = statistics.median(times)
-    min_t = min(times)
-    max_t = max(times)
-    std_dev = statistics.stdev(times) if n > 1 else 0
-    p95 = sorted_times[int(n * 0.95)] if n >= 20 else max_t
-    p99 = sorted_times[int(n * 0.99)] if n >= 100 else max_t
+    stats = compute_stats(times)
+    mean = stats.mean_ms
+    median = stats.median_ms
+    min_t = stats.min_ms
+    max_t = stats.max_ms
+    std_dev = stats.std_dev_ms
+    p95 = stats.p95_ms
+    p99 = stats.p99_ms
 
     print(f"\n延迟统计:")
     print(f"  平均值:     {mean:.1f}ms")
@@ -5,12 +5,144 @@ Skills Optimization Script
 Analyzes and optimizes existing SKILL.md files to follow Claude Code best practices.
 """
 
+import io
 import os
 import re
 import yaml
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+# Use the libyaml-backed loader when PyYAML was built with it
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# All trigger phrases in one alternation, so a description is scanned once
+TRIGGER_RE = re.compile(
+    r'use when'
+    r'|use for'
+    r'|helps? (?:you|to)'
+    r'|when (?:the )?user (?:mentions?|asks?|requests?)'
+    r'|for working with'
+    r'|call when',
+    re.IGNORECASE
+)
+
+# Below this many skills, process pool startup costs more than it saves
+PARALLEL_MIN_SKILLS = 8
+
+
+def has_trigger_words(description: str) -> bool:
+    """Check if description has trigger words."""
+    return TRIGGER_RE.search(description) is not None
+
+
+def analyze_skill(skill_path: Path, skills_dir: Path) -> Dict:
+    """Analyze a single skill file.
+
+    Module-level so it can be sent to worker processes.
+    """
+    with open(skill_path, 'r', encoding='utf-8') as f:
+        # Extract frontmatter: the lines between the opening '---' and the
+        # next line starting with '---'
+        first_line = f.readline()
+        if first_line != '---\n':
+            return {'error': 'No frontmatter found'}
+
+        frontmatter_lines = []
+        for closing_line in f:
+            if frontmatter_lines and closing_line.startswith('---'):
+                break
+            frontmatter_lines.append(closing_line)
+        else:
+            return {'error': 'No frontmatter found'}
+
+        try:
+            metadata = yaml.load(''.join(frontmatter_lines)[:-1], Loader=YamlLoader)
+        except yaml.YAMLError as e:
+            return {'error': f'YAML parsing error: {e}'}
+
+        # Stream the rest of the file, keeping only the stats the checks need
+        content_length = len(first_line)
+        content_lines = 2  # opening line, plus the line after the last newline
+        mentions_script = False
+        for line in chain(frontmatter_lines, (closing_line,), f):
+            content_length += len(line)
+            if line.endswith('\n'):
+                content_lines += 1
+            if not mentions_script and 'script' in line.lower():
+                mentions_script = True
+
+    # Analyze issues and recommendations
+    issues = []
+    recommendations = []
+
+    # Check description quality
+    description = metadata.get('description', '')
+
+    # 1. Check for trigger words
+    if not has_trigger_words(description):
+        issues.append('Description lacks clear trigger words')
+        recommendations.append('Add trigger words like "Use when working with..." or "Use when user mentions..."')
+
+    # 2. Check name format (should be lowercase)
+    name = metadata.get('name', '')
+    if name != name.lower():
+        issues.append('Name should be lowercase')
+        recommendations.append(f'Change name from "{name}" to "{name.lower()}"')
+
+    # 3. Check for advanced fields
+    if 'allowed_tools' not in metadata:
+        recommendations.append('Consider adding allowed-tools field to restrict tool access')
+
+    # 4. Check for progressive disclosure
+    # One directory listing instead of a stat per file; DirEntry.is_dir()
+    # uses the file type returned by the listing, so it needs no extra
+    # syscall unless the entry is a symlink
+    with os.scandir(skill_path.parent) as it:
+        entries = {entry.name: entry for entry in it}
+    has_reference = 'reference.md' in entries
+    has_examples = 'examples.md' in entries
+    has_forms = 'forms.md' in entries
+    scripts_entry = entries.get('scripts')
+    has_scripts = scripts_entry is not None and scripts_entry.is_dir()
+
+    if not has_reference and content_length > 500:
+        recommendations.append('Consider splitting detailed content into reference.md (progressive disclosure)')
+
+    if not has_examples:
+        recommendations.append('Add examples.md with practical usage examples')
+
+    # 5. Check for scripts
+    if not has_scripts and mentions_script:
+        recommendations.append('Add scripts/ directory with utility scripts')
+
+    # 6. Check description length (max 1024 chars per spec)
+    if len(description) > 1024:
+        issues.append(f'Description too long ({len(description)} chars, max 1024)')
+        recommendations.append('Shorten description to under 1024 characters')
+
+    # 7. Check name length (max 64 chars per spec)
+    if len(name) > 64:
+        issues.append(f'Name too long ({len(name)} chars, max 64)')
+        recommendations.append('Shorten name to under 64 characters')
+
+    return {
+        'path': str(skill_path.relative_to(skills_dir.parent)),
+        'name': name,
+        'description': description,
+        'metadata': metadata,
+        'issues': issues,
+        'recommendations': recommendations,
+        'has_reference': has_reference,
+        'has_examples': has_examples,
+        'has_forms': has_forms,
+        'has_scripts': has_scripts,
+        'content_lines': content_lines,
+    }
+
+
 class SkillAnalyzer:
     """Analyze SKILL.md files for optimization opportunities."""
 
@@ -24,147 +156,72 @@ class SkillAnalyzer:
 
     def analyze_skill(self, skill_path: Path) -> Dict:
         """Analyze a single skill file."""
-        with open(skill_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Extract frontmatter
-        frontmatter_match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-        if not frontmatter_match:
-            return {'error': 'No frontmatter found'}
-
-        try:
-            metadata = yaml.safe_load(frontmatter_match.group(1))
-        except yaml.YAMLError as e:
-            return {'error': f'YAML parsing error: {e}'}
-
-        # Analyze issues and recommendations
-        issues = []
-        recommendations = []
-
-        # Check description quality
-        description = metadata.get('description', '')
-
-        # 1. Check for trigger words
-        if not self._has_trigger_words(description):
-            issues.append('Description lacks clear trigger words')
-            recommendations.append('Add trigger words like "Use when working with..." or "Use when user mentions..."')
-
-        # 2. Check name format (should be lowercase)
-        name = metadata.get('name', '')
-        if name != name.lower():
-            issues.append('Name should be lowercase')
-            recommendations.append(f'Change name from "{name}" to "{name.lower()}"')
-
-        # 3. Check for advanced fields
-        if 'allowed_tools' not in metadata:
-            recommendations.append('Consider adding allowed-tools field to restrict tool access')
-
-        # 4. Check for progressive disclosure
-        skill_dir = skill_path.parent
-        has_reference = (skill_dir / 'reference.md').exists()
-        has_examples = (skill_dir / 'examples.md').exists()
-        has_forms = (skill_dir / 'forms.md').exists()
-        has_scripts = (skill_dir / 'scripts').exists() and (skill_dir / 'scripts').is_dir()
-
-        if not has_reference and len(content) > 500:
-            recommendations.append('Consider splitting detailed content into reference.md (progressive disclosure)')
-
-        if not has_examples:
-            recommendations.append('Add examples.md with practical usage examples')
-
-        # 5. Check for scripts
-        if not has_scripts and 'script' in content.lower():
-            recommendations.append('Add scripts/ directory with utility scripts')
-
-        # 6. Check description length (max 1024 chars per spec)
-        if len(description) > 1024:
-            issues.append(f'Description too long ({len(description)} chars, max 1024)')
-            recommendations.append('Shorten description to under 1024 characters')
-
-        # 7. Check name length (max 64 chars per spec)
-        if len(name) > 64:
-            issues.append(f'Name too long ({len(name)} chars, max 64)')
-            recommendations.append('Shorten name to under 64 characters')
-
-        return {
-            'path': str(skill_path.relative_to(self.skills_dir.parent)),
-            'name': name,
-            'description': description,
-            'metadata': metadata,
-            'issues': issues,
-            'recommendations': recommendations,
-            'has_reference': has_reference,
-            'has_examples': has_examples,
-            'has_forms': has_forms,
-            'has_scripts': has_scripts,
-            'content_lines': len(content.split('\n')),
-        }
+        return analyze_skill(skill_path, self.skills_dir)
 
     def _has_trigger_words(self, description: str) -> bool:
         """Check if description has trigger words."""
-        trigger_patterns = [
-            r'use when',
-            r'use for',
-            r'helps? (you|to)',
-            r'when (the )?user (mentions?|asks?|requests?)',
-            r'for working with',
-            r'call when',
-        ]
-        description_lower = description.lower()
-        return any(re.search(pattern, description_lower) for pattern in trigger_patterns)
+        return has_trigger_words(description)
 
     def analyze_all(self) -> List[Dict]:
-        """Analyze all skills."""
-        results = []
-        for skill_path in self.skills:
-            result = self.analyze_skill(skill_path)
-            results.append(result)
-        return results
+        """Analyze all skills, in worker processes for larger trees."""
+        analyze = partial(analyze_skill, skills_dir=self.skills_dir)
+        if len(self.skills) < PARALLEL_MIN_SKILLS:
+            return [analyze(skill_path) for skill_path in self.skills]
+
+        with ProcessPoolExecutor() as executor:
+            return list(executor.map(analyze, self.skills, chunksize=8))
 
     def generate_report(self, results: List[Dict]) -> str:
         """Generate optimization report."""
-        report_lines = [
-            "# Skills Optimization Report\n",
-            f"## Summary",
-            f"- Total Skills: {len(results)}",
-            f"- Skills with Issues: {sum(1 for r in results if r.get('issues'))}",
-            f"- Skills with Recommendations: {sum(1 for r in results if r.get('recommendations'))}",
-            "",
-            "## Detailed Analysis\n",
-        ]
+        buf = io.StringIO()
+        write = buf.write
+
+        write(
+            "# Skills Optimization Report\n\n"
+            "## Summary\n"
+            f"- Total Skills: {len(results)}\n"
+            f"- Skills with Issues: {sum(1 for r in results if r.get('issues'))}\n"
+            f"- Skills with Recommendations: {sum(1 for r in results if r.get('recommendations'))}\n"
+            "\n"
+            "## Detailed Analysis\n\n"
+        )
 
         for i, result in enumerate(results, 1):
             if 'error' in result:
-                report_lines.append(f"### {i}. {result.get('path', 'Unknown')}")
-                report_lines.append(f"**Error**: {result['error']}\n")
+                write(f"### {i}. {result.get('path', 'Unknown')}\n")
+                write(f"**Error**: {result['error']}\n\n")
                 continue
 
-            report_lines.append(f"### {i}. {result['name']}")
-            report_lines.append(f"**Path**: `{result['path']}`")
-            report_lines.append(f"**Lines**: {result['content_lines']}")
-            report_lines.append(f"**Description**: {result['description'][:100]}...")
+            write(
+                f"### {i}. {result['name']}\n"
+                f"**Path**: `{result['path']}`\n"
+                f"**Lines**: {result['content_lines']}\n"
+                f"**Description**: {result['description'][:100]}...\n"
+            )
 
             if result['issues']:
-                report_lines.append(f"\n**Issues**:")
+                write("\n**Issues**:\n")
                 for issue in result['issues']:
-                    report_lines.append(f"- ❌ {issue}")
+                    write(f"- ❌ {issue}\n")
 
             if result['recommendations']:
-                report_lines.append(f"\n**Recommendations**:")
+                write("\n**Recommendations**:\n")
                 for rec in result['recommendations']:
-                    report_lines.append(f"- 💡 {rec}")
+                    write(f"- 💡 {rec}\n")
 
             # Show structure
-            report_lines.append(f"\n**Structure**:")
-            report_lines.append(f"- SKILL.md: ✓")
-            report_lines.append(f"- reference.md: {'✓' if result['has_reference'] else '✗'}")
-            report_lines.append(f"- examples.md: {'✓' if result['has_examples'] else '✗'}")
-            report_lines.append(f"- forms.md: {'✓' if result['has_forms'] else '✗'}")
-            report_lines.append(f"- scripts/: {'✓' if result['has_scripts'] else '✗'}")
+            write(
+                "\n**Structure**:\n"
+                "- SKILL.md: ✓\n"
+                f"- reference.md: {'✓' if result['has_reference'] else '✗'}\n"
+                f"- examples.md: {'✓' if result['has_examples'] else '✗'}\n"
+                f"- forms.md: {'✓' if result['has_forms'] else '✗'}\n"
+                f"- scripts/: {'✓' if result['has_scripts'] else '✗'}\n"
+            )
 
-            report_lines.append("\n" + "-" * 80 + "\n")
+            write("\n" + "-" * 80 + "\n\n")
 
-        return "\n".join(report_lines)
+        return buf.getvalue()
 
     def generate_priority_list(self, results: List[Dict]) -> List[Dict]:
         """Generate prioritized list of skills needing optimization."""
@@ -226,33 +283,35 @@ def main():
     prioritized = analyzer.generate_priority_list(results)
 
     priority_path = script_dir.parent / "SKILLS_OPTIMIZATION_PRIORITY.md"
-    priority_lines = [
-        "# Skills Optimization Priority List\n",
-        f"## Top {len(prioritized)} Skills Needing Optimization\n",
-        "Sorted by priority score (highest = most urgent)\n",
-    ]
+    buf = io.StringIO()
+    write = buf.write
+    write(
+        "# Skills Optimization Priority List\n\n"
+        f"## Top {len(prioritized)} Skills Needing Optimization\n\n"
+        "Sorted by priority score (highest = most urgent)\n\n"
+    )
 
     for i, skill in enumerate(prioritized, 1):
-        priority_lines.extend([
-            f"### {i}. {skill['name']} (Priority: {skill['priority_score']})",
-            f"**Path**: `{skill['path']}`\n",
-        ])
+        write(
+            f"### {i}. {skill['name']} (Priority: {skill['priority_score']})\n"
+            f"**Path**: `{skill['path']}`\n\n"
+        )
 
         if skill['issues']:
-            priority_lines.append("**Critical Issues**:")
+            write("**Critical Issues**:\n")
             for issue in skill['issues']:
-                priority_lines.append(f"- ❌ {issue}")
-            priority_lines.append("")
+                write(f"- ❌ {issue}\n")
+            write("\n")
 
         if skill['recommendations']:
-            priority_lines.append("**Recommendations**:")
+            write("**Recommendations**:\n")
             for rec in skill['recommendations'][:5]:  # Top 5
-                priority_lines.append(f"- 💡 {rec}")
-            priority_lines.append("")
+                write(f"- 💡 {rec}\n")
+            write("\n")
 
-        priority_lines.append("-" * 80 + "\n")
+        write("-" * 80 + "\n\n")
 
-    priority_path.write_text("\n".join(priority_lines), encoding='utf-8')
+    priority_path.write_text(buf.getvalue(), encoding='utf-8')
     print(f"✓ Generated priority list: {priority_path}")
 
     # Print summary
@@ -3,61 +3,54 @@
 快速性能测试脚本 - 测试实际查询性能
 """
 
-import subprocess
-import time
-import statistics
-from pathlib import Path
+import asyncio
+import sys
 
+from _bench_stats import compute_stats
+from benchmark_sdk_comparison import RUST_EXAMPLE, SDKBenchmark
 
-def time_rust_query(prompt: str, iterations: int = 10) -> dict:
-    """测试Rust SDK查询性能"""
+
+PROGRESS_LINE = "  迭代 {}/{}: {:.1f}ms"
+
+
+async def time_rust_query(benchmark: SDKBenchmark, prompt: str, iterations: int = 10) -> dict:
+    """测试Rust SDK查询性能 (复用benchmark的常驻Rust进程)"""
     print(f"\n{'='*60}")
     print(f"测试Rust SDK性能 - {iterations}次迭代")
     print(f"Prompt: {prompt[:50]}...")
     print(f"{'='*60}\n")
 
     times = []
+    # 成功的迭代只在终端上显示进度, 且最多显示约20次
+    show_progress = sys.stdout.isatty()
+    progress_every = max(1, iterations // 20)
 
     for i in range(iterations):
-        start = time.perf_counter()
-
-        try:
-            result = subprocess.run(
-                ["cargo", "run", "--release", "--example", "01_hello_world"],
-                input=prompt.encode(),
-                capture_output=True,
-                timeout=30,
-                cwd=Path(__file__).parent.parent
-            )
-
-            if result.returncode == 0:
-                elapsed = (time.perf_counter() - start) * 1000
-                times.append(elapsed)
-                print(f"  迭代 {i+1}/{iterations}: {elapsed:.1f}ms")
-            else:
-                print(f"  迭代 {i+1}/{iterations}: 失败")
-                if result.stderr:
-                    print(f"    错误: {result.stderr.decode()[:200]}")
-        except subprocess.TimeoutExpired:
-            print(f"  迭代 {i+1}/{iterations}: 超时 (>30s)")
+        elapsed = await benchmark.query_rust(prompt)
+
+        if elapsed > 0:
+            times.append(elapsed)
+            done = i + 1
+            if show_progress and (done % progress_every == 0 or done == iterations):
+                print(PROGRESS_LINE.format(done, iterations, elapsed))
+        else:
+            print(f"  迭代 {i+1}/{iterations}: 失败或超时 (>{benchmark.timeout}s)")
 
     if not times:
         print("\n❌ 所有测试都失败了！")
         return None
 
     # 计算统计数据
-    sorted_times = sorted(times)
-    n = len(times)
-
+    result = compute_stats(times)
     stats = {
-        'mean': statistics.mean(times),
-        'median': statistics.median(times),
-        'min': min(times),
-        'max': max(times),
-        'p95': sorted_times[int(n * 0.95)] if n >= 20 else max(times),
-        'p99': sorted_times[int(n * 0.99)] if n >= 100 else max(times),
-        'std_dev': statistics.stdev(times) if n > 1 else 0,
-        'samples': n,
+        'mean': result.mean_ms,
+        'median': result.median_ms,
+        'min': result.min_ms,
+        'max': result.max_ms,
+        'p95': result.p95_ms,
+        'p99': result.p99_ms,
+        'std_dev': result.std_dev_ms,
+        'samples': result.samples,
         'all_times': times
     }
 
@@ -75,7 +68,7 @@ def time_rust_query(prompt: str, iterations: int = 10) -> dict:
     return stats
 
 
-def main():
+async def main():
     print("🚀 Claude Agent SDK - Rust性能测试")
     print("="*60)
 
@@ -87,15 +80,22 @@ def main():
     ]
 
     all_results = {}
-
-    for name, prompt, iterations in test_cases:
-        print(f"\n{'#'*60}")
-        print(f"场景: {name}")
-        print(f"{'#'*60}")
-
-        result = time_rust_query(prompt, iterations)
-        if result:
-            all_results[name] = result
+    benchmark = SDKBenchmark(timeout=30)
+    if not benchmark.prepare_rust_example(RUST_EXAMPLE):
+        print("\n❌ Rust示例编译失败，无法测试")
+        return
+
+    try:
+        for name, prompt, iterations in test_cases:
+            print(f"\n{'#'*60}")
+            print(f"场景: {name}")
+            print(f"{'#'*60}")
+
+            result = await time_rust_query(benchmark, prompt, iterations)
+            if result:
+                all_results[name] = result
+    finally:
+        await benchmark.aclose()
 
     # 生成总结报告
     if all_results:
@@ -136,4 +136,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,11 +1,222 @@
 #!/usr/bin/env python3
 """
 简单直接的性能测试
+
+启动一次常驻的Rust benchmark进程, 通过stdin/stdout发送查询。默认只发送
+一次查询; --queries N 连续发送N次, 第一次作为预热丢弃, 其余查询反映稳定
+状态下的单次延迟。--throughput 额外用一组常驻进程并发查询, 测量吞吐量。
+每次查询都是一次计费的API调用。
 """
+import argparse
+import atexit
+import json
+import queue
+import select
+import shutil
+import statistics
 import subprocess
 import time
 import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+# 常驻benchmark示例: 每行一个prompt, 每行一个JSON响应 (查询进行中每秒一行keepalive)
+SERVER_EXAMPLE = "70_benchmark_server"
+# 比编译产物更新时需要重新编译的源码 (相对于仓库根目录)
+SOURCE_DIRS = ("crates",)
+SOURCE_FILES = ("Cargo.toml", "Cargo.lock")
+# 单次查询超时 (秒)
+QUERY_TIMEOUT = 120
+# 超过该时间 (秒) 连keepalive都没有收到, 认为进程已卡死
+KEEPALIVE_TIMEOUT = 5
+# 并发吞吐测试的默认常驻进程数和总查询次数 (进程数保持较小, 避免API限流)
+POOL_SIZE = 4
+PARALLEL_QUERIES = 8
+
+
+class PersistentClient:
+    """常驻的Rust benchmark进程, 所有查询共用同一个进程"""
+
+    def __init__(self, binary_path: str):
+        self.binary_path = binary_path
+        self.proc = self._spawn()
+        # 已读取但尚未组成完整行的stdout数据
+        self._buf = b""
+
+    def _spawn(self) -> subprocess.Popen:
+        return subprocess.Popen(
+            [self.binary_path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0,
+            cwd="."
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def query(self, prompt: str):
+        """发送一次查询, 返回 (往返耗时ms, 响应); 进程卡死时重启并重试一次"""
+        elapsed, response, wedged = self._query_once(prompt)
+        if wedged:
+            print(f"   ⚠️  benchmark进程 {KEEPALIVE_TIMEOUT}s 内没有任何输出, 重启后重试")
+            self.restart()
+            elapsed, response, wedged = self._query_once(prompt)
+            if wedged:
+                self.restart()
+        return elapsed, response
+
+    def _query_once(self, prompt: str):
+        """发送一次查询, 返回 (往返耗时ms, 响应, 进程是否卡死)
+
+        查询进行中服务端每秒输出一行keepalive: 仍有keepalive说明只是API慢,
+        等到 QUERY_TIMEOUT 为止; 连keepalive都没有说明进程已卡死, 尽早放弃。
+        """
+        start = time.perf_counter_ns()
+        try:
+            self.proc.stdin.write(prompt.replace("\n", " ").encode() + b"\n")
+        except BrokenPipeError:
+            return -1, {"error": f"benchmark进程已退出 (退出码 {self.proc.wait()})"}, False
+
+        deadline = time.monotonic() + QUERY_TIMEOUT
+        last_byte_time = time.monotonic()
+        while True:
+            # 先处理缓冲区中已完整的行, 其余数据留给后续读取
+            line, newline, rest = self._buf.partition(b"\n")
+            if newline:
+                self._buf = rest
+                try:
+                    response = json.loads(line)
+                except ValueError:
+                    # 非JSON的输出 (如混入stdout的日志) 视为噪声
+                    continue
+                if isinstance(response, dict) and not response.get("keepalive"):
+                    return (time.perf_counter_ns() - start) / 1e6, response, False
+                continue
+
+            now = time.monotonic()
+            if now >= deadline:
+                # 进程中仍有未完成的查询, 重启以免下次读到过期的响应
+                self.restart()
+                return -1, {"error": f"request timed out after {QUERY_TIMEOUT}s"}, False
+            if now - last_byte_time >= KEEPALIVE_TIMEOUT:
+                return -1, {"error": f"benchmark进程无响应 (超过 {KEEPALIVE_TIMEOUT}s 没有输出)"}, True
+
+            wait = min(deadline, last_byte_time + KEEPALIVE_TIMEOUT) - now
+            ready, _, _ = select.select([self.proc.stdout], [], [], wait)
+            if not ready:
+                continue
+
+            # 用os.read读取已到达的数据并自行拆分行: readline()在没有换行符时
+            # 会一直阻塞, 使上面的超时失效
+            chunk = os.read(self.proc.stdout.fileno(), 65536)
+            if not chunk:
+                return -1, {"error": f"benchmark进程已退出 (退出码 {self.proc.wait()})"}, False
+            last_byte_time = time.monotonic()
+            self._buf += chunk
+
+    def restart(self):
+        """用SIGTERM结束当前进程并重新启动"""
+        self.proc.terminate()
+        self.close()
+        self.proc = self._spawn()
+        self._buf = b""
+
+    def close(self):
+        """关闭stdin让进程退出, 超时则强制结束"""
+        try:
+            self.proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+
+
+class BinaryPool:
+    """预先启动的一组常驻进程, 每个进程同一时间只处理一个查询"""
+
+    def __init__(self, binary_path: str, size: Optional[int] = None):
+        size = size or os.cpu_count() or 1
+        self._clients = [PersistentClient(binary_path) for _ in range(size)]
+        self._idle = queue.Queue()
+        for client in self._clients:
+            self._idle.put(client)
+        self._executor = ThreadPoolExecutor(max_workers=size)
+        self._closed = False
+        # 异常退出时也要关闭所有子进程
+        atexit.register(self.close)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, prompt: str) -> Future:
+        """提交一次查询, Future的结果为 (往返耗时ms, 响应)"""
+        return self._executor.submit(self._query, prompt)
+
+    def _query(self, prompt: str):
+        client = self._idle.get()
+        try:
+            return client.query(prompt)
+        finally:
+            self._idle.put(client)
+
+    def close(self):
+        """等待进行中的查询完成, 然后关闭所有进程"""
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        for client in self._clients:
+            client.close()
+
+
+def needs_rebuild(binary: str) -> bool:
+    """编译产物不存在, 或有任何 Rust 源码/Cargo 清单比它更新时需要重新编译"""
+    try:
+        binary_mtime = os.path.getmtime(binary)
+    except OSError:
+        return True
+
+    for name in SOURCE_FILES:
+        if os.path.exists(name) and os.path.getmtime(name) > binary_mtime:
+            return True
+
+    for root in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(root):
+            # 跳过嵌套的编译输出目录
+            if "target" in dirnames:
+                dirnames.remove("target")
+            for filename in filenames:
+                if filename.endswith(".rs") or filename == "Cargo.toml":
+                    if os.path.getmtime(os.path.join(dirpath, filename)) > binary_mtime:
+                        return True
+    return False
+
+
+parser = argparse.ArgumentParser(description="简单直接的性能测试")
+parser.add_argument("--skip-build", action="store_true",
+                    help="不检查源码是否更新, 直接使用已有的编译产物")
+parser.add_argument("--queries", type=int, default=1,
+                    help="通过同一个进程发送的查询次数; 大于1时第一次作为预热不计入统计 (默认1)")
+parser.add_argument("--throughput", action="store_true",
+                    help="额外运行并发吞吐测试")
+parser.add_argument("--pool-size", type=int, default=POOL_SIZE,
+                    help=f"吞吐测试的常驻进程数 (默认{POOL_SIZE})")
+parser.add_argument("--parallel-queries", type=int, default=PARALLEL_QUERIES,
+                    help=f"吞吐测试的总查询次数 (默认{PARALLEL_QUERIES})")
+args = parser.parse_args()
+if min(args.queries, args.pool_size, args.parallel_queries) < 1:
+    parser.error("查询次数和进程数必须大于等于1")
 
 print("🚀 运行单次查询测试...")
 print("-" * 60)
@@ -18,12 +229,22 @@ if not api_key or len(api_key) < 10:
     print("\n   跳过测试 (需要有效的API密钥)")
     sys.exit(0)
 
-# Check if binary exists, otherwise build it
-binary_path = "./target/release/examples/01_hello_world"
-if not os.path.exists(binary_path):
-    print("📦 首次运行，编译示例...")
+# Build only when the binary is missing or older than the sources
+binary_path = f"./target/release/examples/{SERVER_EXAMPLE}"
+if args.skip_build:
+    if not os.path.exists(binary_path):
+        print(f"❌ 错误: --skip-build 但找不到编译产物 {binary_path}")
+        sys.exit(1)
+elif needs_rebuild(binary_path):
+    if shutil.which("cargo") is None:
+        print("❌ 错误: 需要编译示例, 但找不到 cargo")
+        sys.exit(1)
+    if os.path.exists(binary_path):
+        print("📦 源码已更新，重新编译示例...")
+    else:
+        print("📦 首次运行，编译示例...")
     build_result = subprocess.run(
-        ["cargo", "build", "--release", "--example", "01_hello_world"],
+        ["cargo", "build", "--release", "--example", SERVER_EXAMPLE],
         capture_output=True,
         timeout=300
     )
@@ -31,50 +252,72 @@ if not os.path.exists(binary_path):
         print("❌ 编译失败:")
         print(build_result.stderr.decode()[-500:])
         sys.exit(1)
+    # 与示例无关的源码改动不会让 cargo 重新链接, 产物的 mtime 不变;
+    # 编译成功后手动更新 mtime, 避免之后每次运行都重新调用 cargo
+    os.utime(binary_path)
     print("✅ 编译完成")
 
 prompt = "What is 2 + 2?"
-start = time.perf_counter()
 
-# Use the pre-built binary instead of cargo run
-result = subprocess.run(
-    [binary_path],
-    input=prompt.encode(),
-    capture_output=True,
-    timeout=120,
-    cwd="."
-)
+with PersistentClient(binary_path) as client:
+    # 多次查询时, 第一次查询包含进程启动和连接池建立, 只作为预热
+    warmup_ms = None
+    times = []
+    for i in range(args.queries):
+        elapsed_ms, response = client.query(prompt)
+        if "error" in response:
+            break
+        if i == 0 and args.queries > 1:
+            warmup_ms = elapsed_ms
+        else:
+            times.append(elapsed_ms)
 
-elapsed = (time.perf_counter() - start) * 1000
-
-print(f"✅ 完成！")
-print(f"   总耗时: {elapsed:.1f}ms")
-print(f"   返回码: {result.returncode}")
-
-if result.returncode == 0:
-    output = result.stdout.decode()
-    print(f"   输出长度: {len(output)} 字符")
-    print(f"\n   输出预览:")
-    print("   " + "\n   ".join(output.split('\n')[:10]))
-else:
-    stderr = result.stderr.decode()
-    stdout = result.stdout.decode()
+if "error" in response:
+    error = str(response["error"])
     print(f"   错误输出:")
-    print(f"   stderr: {stderr[:300]}")
-    if stdout:
-        print(f"   stdout: {stdout[:300]}")
+    print(f"   {error[:300]}")
 
     # Check for common API errors
-    if "401" in stderr or "authentication" in stderr.lower():
+    if "401" in error or "authentication" in error.lower():
         print(f"\n   ❌ API认证失败: 请检查 ANTHROPIC_API_KEY 是否正确")
-    elif "timeout" in stderr.lower() or "timed out" in stderr.lower():
+    elif "timeout" in error.lower() or "timed out" in error.lower():
         print(f"\n   ⏱️  请求超时: 可能是网络问题")
-    elif "rate" in stderr.lower():
+    elif "rate" in error.lower():
         print(f"\n   ⚠️  速率限制: API请求过于频繁")
 
     # Exit gracefully on error
     sys.exit(0)
 
+# 后续各项统计都基于预热后的查询
+elapsed = statistics.median(times)
+if len(times) > 1:
+    percentiles = statistics.quantiles(times, n=100, method='inclusive')
+    p90, p99 = percentiles[89], percentiles[98]
+else:
+    p90 = p99 = times[0]
+
+print(f"✅ 完成！")
+if warmup_ms is not None:
+    print(f"   预热查询: {warmup_ms:.1f}ms (含进程启动, 不计入统计)")
+    print(f"   计时查询: {len(times)} 次")
+else:
+    print(f"   单次查询 (含进程启动)")
+print(f"   P50: {elapsed:.1f}ms")
+print(f"   P90: {p90:.1f}ms")
+print(f"   P99: {p99:.1f}ms")
+
+# 并发吞吐: 多个常驻进程同时处理查询 (每个进程的第一次查询包含启动开销)
+if args.throughput:
+    with BinaryPool(binary_path, args.pool_size) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(prompt) for _ in range(args.parallel_queries)]
+        responses = [future.result()[1] for future in futures]
+        wall_time = time.perf_counter() - start
+
+    succeeded = sum(1 for r in responses if "error" not in r)
+    print(f"   并发查询: {succeeded}/{args.parallel_queries} 成功 ({args.pool_size} 个进程)")
+    print(f"   吞吐量: {succeeded / wall_time:.2f} 次/秒")
+
 # 性能分析
 print(f"\n{'='*60}")
 print("📊 性能分析:")
@@ -9,101 +9,172 @@ SKILL.md 功能验证脚本
 - 依赖关系分析
 """
 
+import json
+import mmap
 import os
 import re
 import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from collections import Counter
-
-def parse_frontmatter(content: str) -> Tuple[Dict[str, str], str]:
-    """解析 YAML frontmatter 和 markdown 内容"""
-    lines = content.split('\n')
-
-    if len(lines) < 2:
-        raise ValueError("文件内容太少")
-
-    # 查找 frontmatter 开始和结束
-    if not lines[0].strip().startswith('---'):
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+import yaml
+
+try:
+    import orjson  # 可选依赖, 加速缓存和 JSON 输出的序列化
+except ImportError:
+    orjson = None
+
+# 优先使用 libyaml 提供的 C 加速加载器。使用 BaseLoader: 标量一律保留为原始字符串,
+# 避免 version: 1.10 被解析为浮点数 1.1、日期被解析为 datetime.date
+YamlLoader = getattr(yaml, 'CBaseLoader', yaml.BaseLoader)
+
+# frontmatter 与正文: 开头的 --- 与下一个独占一行的 --- 之间为 YAML
+# (直接匹配原始 UTF-8 字节, 整个文件不需要解码)
+# (结束标记后可以直接是文件末尾, 此时正文为空)
+_FRONTMATTER_RE = re.compile(rb'\A---\r?\n(.*?)\r?\n---[ \t]*(?:\r?\n(.*))?\Z', re.DOTALL)
+
+# 解析结果缓存 (按 SKILL.md 的路径、mtime 和大小失效); 解析逻辑变化时递增版本号
+CACHE_PATH = Path(".cache") / "verify_skills.json"
+CACHE_VERSION = 4
+
+# 超过该大小的 SKILL.md 用 O_DIRECT 读取, 避免经过页缓存的额外拷贝
+DIRECT_IO_MIN_SIZE = 16 * 1024
+# O_DIRECT 要求缓冲区地址和读取长度按块对齐
+DIRECT_IO_ALIGN = 4096
+# 不支持 O_DIRECT 的平台 (如 macOS) 上为 0, 始终使用普通读取
+O_DIRECT = getattr(os, 'O_DIRECT', 0)
+
+# 必需的 frontmatter 字段, 加载时统一为字符串
+REQUIRED_FIELDS = ('name', 'description', 'version')
+
+# 取值为列表的 frontmatter 字段, 加载时统一为元组
+LIST_FIELDS = ('tags', 'dependencies')
+
+# 编程语言检测关键字, 按优先级排列: 出现任一关键字即命中, 同时命中多种语言时取最靠前的
+LANGUAGE_KEYWORDS = (
+    ('中文', ('中文', '专家')),
+    ('Rust', ('rust', 'fn ', 'let mut')),
+    ('Python', ('python', 'def ', 'import ')),
+    ('JavaScript/TypeScript', ('javascript', 'typescript', 'const ')),
+    ('Swift', ('swift', '@main')),
+    ('Kotlin', ('kotlin', 'fun ')),
+    ('Go', (' go ', 'func ')),
+    ('SQL', ('sql', 'select ')),
+)
+
+# 每种语言的关键字合并为一个命名分组 (lang0 优先级最高); 放在前瞻中匹配,
+# 使相互重叠的关键字也都能被找到。匹配 UTF-8 字节, 关键字的大小写只涉及 ASCII
+_LANGUAGE_GROUPS = [
+    b'(?P<lang%d>' % rank + b'|'.join(re.escape(keyword.encode('utf-8')) for keyword in keywords) + b')'
+    for rank, (_, keywords) in enumerate(LANGUAGE_KEYWORDS)
+]
+_LANGUAGE_RANKS = {f'lang{rank}': rank for rank in range(len(LANGUAGE_KEYWORDS))}
+
+# _LANGUAGE_RES[k] 只包含优先级最高的 k 种语言: 命中一种语言后, 只需继续查找比它更优先的语言
+_LANGUAGE_RES = [None] + [
+    re.compile(b'(?=' + b'|'.join(_LANGUAGE_GROUPS[:count]) + b')', re.IGNORECASE)
+    for count in range(1, len(LANGUAGE_KEYWORDS) + 1)
+]
+
+
+def parse_frontmatter(content: Union[bytes, mmap.mmap]) -> Tuple[Dict, bytes]:
+    """解析 YAML frontmatter 和 markdown 内容 (markdown 内容保持为字节)"""
+    if content[:3] != b'---':
         raise ValueError("缺少 frontmatter 开始标记")
 
-    yaml_lines = []
-    frontmatter_end = None
-
-    for i, line in enumerate(lines[1:], 1):
-        if line.strip().startswith('---'):
-            frontmatter_end = i
-            break
-        yaml_lines.append(line)
-
-    if frontmatter_end is None:
+    match = _FRONTMATTER_RE.match(content)
+    if match is None:
         raise ValueError("缺少 frontmatter 结束标记")
 
-    # 解析 YAML 字段
-    metadata = {}
-    current_field = None
-    current_value = []
-
-    for line in yaml_lines:
-        line = line.strip()
-
-        # 跳过空行和注释
-        if not line or line.startswith('#'):
-            continue
-
-        # 检查是否是字段定义
-        if ':' in line and not line.startswith('-'):
-            # 保存前一个字段
-            if current_field:
-                if isinstance(current_value, list):
-                    metadata[current_field] = current_value
-                else:
-                    metadata[current_field] = '\n'.join(current_value)
-                current_value = []
-
-            # 解析新字段
-            key, value = line.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-
-            if value:
-                metadata[key] = value
-                current_field = None
-            else:
-                current_field = key
-                current_value = []
-        elif line.startswith('-'):
-            # 列表项
-            item = line[1:].strip()
-            if current_field:
-                if not isinstance(current_value, list):
-                    current_value = []
-                current_value.append(item)
-        elif current_field:
-            # 多行值
-            current_value.append(line)
-
-    # 保存最后一个字段
-    if current_field:
-        metadata[current_field] = current_value
-
-    # 提取 markdown 内容
-    markdown_content = '\n'.join(lines[frontmatter_end + 1:])
-
-    return metadata, markdown_content
-
-
-def load_skill(skill_dir: Path) -> Tuple[Dict, str, List[str]]:
-    """加载单个 SKILL.md 文件"""
-    skill_md = skill_dir / "SKILL.md"
-
-    if not skill_md.exists():
-        raise FileNotFoundError(f"SKILL.md 文件不存在: {skill_md}")
-
-    with open(skill_md, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    metadata, markdown_content = parse_frontmatter(content)
+    # 解析 YAML 字段 (libyaml 直接读取 UTF-8 字节)
+    try:
+        metadata = yaml.load(match.group(1), Loader=YamlLoader) or {}
+    except yaml.YAMLError as e:
+        raise ValueError(f"frontmatter YAML 解析失败: {e}") from e
+
+    if not isinstance(metadata, dict):
+        raise ValueError("frontmatter 不是键值映射")
+
+    return metadata, match.group(2) or b''
+
+
+def _read_direct(path: str, size: int) -> Optional[bytes]:
+    """用 O_DIRECT 把文件读入页对齐的缓冲区, 文件系统不支持时返回 None"""
+    try:
+        fd = os.open(path, os.O_RDONLY | O_DIRECT)
+    except OSError:
+        return None
+
+    # 匿名 mmap 总是页对齐的; 长度向上取整为对齐大小的整数倍
+    buf = mmap.mmap(-1, -(-size // DIRECT_IO_ALIGN) * DIRECT_IO_ALIGN)
+    view = memoryview(buf)
+    try:
+        total = 0
+        while total < size:
+            n = os.readv(fd, [view[total:]])
+            if n == 0:
+                break
+            total += n
+        return bytes(view[:total])
+    except OSError:
+        return None
+    finally:
+        view.release()
+        buf.close()
+        os.close(fd)
+
+
+def _as_tuple(value) -> Tuple:
+    """把列表字段统一为元组: 缺失为空元组, 逗号分隔的字符串拆分为多项"""
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    if isinstance(value, str):
+        return tuple(item.strip() for item in value.split(',') if item.strip())
+    return (value,)
+
+
+def read_skill_md(skill_dir: str) -> Union[bytes, mmap.mmap]:
+    """读取 SKILL.md 的原始字节
+
+    较大的文件绕过页缓存直接读取; 其余文件只读映射到内存, 正则直接在
+    映射上匹配, 不把整个文件复制到 Python 堆上。调用方负责关闭返回的 mmap。
+    """
+    skill_md = os.path.join(skill_dir, "SKILL.md")
+
+    try:
+        size = os.stat(skill_md).st_size
+    except FileNotFoundError:
+        raise FileNotFoundError(f"SKILL.md 文件不存在: {skill_md}") from None
+
+    if O_DIRECT and size > DIRECT_IO_MIN_SIZE:
+        data = _read_direct(skill_md, size)
+        if data is not None:
+            return data
+
+    # 空文件无法映射
+    if size == 0:
+        return b''
+
+    with open(skill_md, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_skill(skill_dir: str,
+               raw: Union[bytes, mmap.mmap, None] = None) -> Tuple[Dict, bytes, List[str]]:
+    """加载单个 SKILL.md 文件 (raw 为已读取的文件内容时不再读取; 为 mmap 时解析后关闭)"""
+    if raw is None:
+        raw = read_skill_md(skill_dir)
+
+    try:
+        metadata, markdown_content = parse_frontmatter(raw)
+    finally:
+        if isinstance(raw, mmap.mmap):
+            raw.close()
 
     # 提取必需字段
     errors = []
@@ -117,11 +188,101 @@ def load_skill(skill_dir: Path) -> Tuple[Dict, str, List[str]]:
     if 'version' not in metadata:
         errors.append("缺少 version 字段")
 
+    # 必需字段统一为字符串, 空值 (如只写了 description:) 为空字符串
+    for field in REQUIRED_FIELDS:
+        if field in metadata:
+            value = metadata[field]
+            metadata[field] = '' if value is None else str(value)
+
+    for field in LIST_FIELDS:
+        metadata[field] = _as_tuple(metadata.get(field))
+
     return metadata, markdown_content, errors
 
 
+def _read_skill_safe(entry: os.DirEntry) -> Union[bytes, mmap.mmap, Exception]:
+    """读取技能的 SKILL.md, 失败时返回异常而不是抛出"""
+    try:
+        return read_skill_md(entry.path)
+    except Exception as e:
+        return e
+
+
+def _load_skill_safe(entry: os.DirEntry, raw: Union[bytes, mmap.mmap, Exception]) -> Tuple[bool, Dict]:
+    """解析已读取的技能, 返回 (是否成功, 技能统计或错误信息), 不抛出异常
+
+    结果中不含路径, 可以直接写入缓存。
+    """
+    if isinstance(raw, Exception):
+        return False, {'error': str(raw)}
+
+    try:
+        metadata, content, parse_errors = load_skill(entry.path, raw)
+    except Exception as e:
+        return False, {'error': str(e)}
+
+    if parse_errors:
+        return False, {'error': f"解析错误: {', '.join(parse_errors)}"}
+
+    return True, {
+        'metadata': metadata,
+        'line_count': content.count(b'\n') + 1,
+        'language': detect_language(content)
+    }
+
+
+def _cache_key(entry: os.DirEntry) -> Optional[str]:
+    """缓存键: SKILL.md 的路径、mtime 和大小; 文件不存在时为 None"""
+    skill_md = os.path.join(entry.path, "SKILL.md")
+    try:
+        st = os.stat(skill_md)
+    except OSError:
+        return None
+    return f"{skill_md}|{st.st_mtime_ns}|{st.st_size}"
+
+
+def _dumps(obj) -> bytes:
+    """序列化为 UTF-8 编码的 JSON; YAML 中的日期等值按 str() 保存, 与打印时的格式一致"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str,
+                            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def _loads(data: bytes):
+    """解析 UTF-8 编码的 JSON"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def load_cache() -> Dict[str, List]:
+    """读取解析结果缓存, 版本不匹配或缓存损坏时返回空缓存"""
+    try:
+        cached = _loads(CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(cached, dict) or cached.get('version') != CACHE_VERSION:
+        return {}
+    return cached.get('entries') or {}
+
+
+def store_cache(entries: Dict[str, List]):
+    """写入解析结果缓存 (写入失败时忽略)"""
+    try:
+        CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_PATH.write_bytes(_dumps({'version': CACHE_VERSION, 'entries': entries}))
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 def scan_skills_dir(skills_dir: Path) -> Tuple[List[Dict], List[Dict]]:
-    """扫描所有技能目录"""
+    """扫描所有技能目录
+
+    SKILL.md 未修改的技能直接复用缓存的解析结果; 其余技能先用线程池
+    一次性读取, 再在主线程中逐个解析。
+    """
     skills = []
     errors = []
 
@@ -132,171 +293,201 @@ def scan_skills_dir(skills_dir: Path) -> Tuple[List[Dict], List[Dict]]:
         })
         return skills, errors
 
-    for entry in skills_dir.iterdir():
-        if entry.is_dir():
-            try:
-                metadata, content, parse_errors = load_skill(entry)
-
-                if parse_errors:
-                    errors.append({
-                        'path': str(entry),
-                        'error': f"解析错误: {', '.join(parse_errors)}"
-                    })
-                else:
-                    skills.append({
-                        'metadata': metadata,
-                        'content': content,
-                        'path': entry
-                    })
-            except Exception as e:
-                errors.append({
-                    'path': str(entry),
-                    'error': str(e)
-                })
+    # DirEntry.is_dir() 使用目录项中缓存的类型, 不必为每个条目单独 stat
+    with os.scandir(skills_dir) as it:
+        entries = [entry for entry in it if entry.is_dir()]
+    if not entries:
+        return skills, errors
+
+    cache = load_cache()
+    keys = [_cache_key(entry) for entry in entries]
+    misses = [entry for entry, key in zip(entries, keys) if key not in cache]
+
+    # 读取阶段: 所有读取同时进行, 重叠 I/O 等待
+    raws = {}
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(32, len(misses))) as executor:
+            raws = dict(zip((entry.path for entry in misses),
+                            executor.map(_read_skill_safe, misses)))
+
+    # 解析阶段: YAML 解析受 GIL 限制, 放在线程中没有收益; 按目录顺序输出
+    new_cache = {}
+    for entry, key in zip(entries, keys):
+        cacheable = key is not None
+        if key in cache:
+            ok, result = cache[key]
+            if ok:
+                # JSON 中保存为数组, 恢复为元组
+                metadata = result['metadata']
+                for field in LIST_FIELDS:
+                    metadata[field] = tuple(metadata[field])
+        else:
+            raw = raws[entry.path]
+            ok, result = _load_skill_safe(entry, raw)
+            # 读取失败 (如权限不足) 与文件内容无关, 不缓存, 下次重新读取
+            cacheable = cacheable and not isinstance(raw, Exception)
+        if cacheable:
+            new_cache[key] = [ok, result]
+
+        if ok:
+            skills.append({**result, 'path': Path(entry.path)})
+        else:
+            errors.append({'path': entry.path, **result})
+
+    # 只保留本次扫描到的技能, 已删除的技能不会留在缓存中
+    if new_cache != cache:
+        store_cache(new_cache)
 
     return skills, errors
 
 
-def print_statistics(skills: List[Dict], errors: List[Dict]):
-    """打印详细统计信息"""
-    print("\n╔════════════════════════════════════════════════════════════╗")
-    print("║           🎯 SKILL.md 功能验证报告                        ║")
-    print("╚════════════════════════════════════════════════════════════╝")
+def detect_language(content: bytes) -> str:
+    """检测技能内容的主要编程语言 (不解码也不生成小写副本)
+
+    依次用越来越小的正则查找更优先的语言, 找不到时立即结束。
+    """
+    best = len(LANGUAGE_KEYWORDS)
+    pos = 0
+    while best:
+        match = _LANGUAGE_RES[best].search(content, pos)
+        if match is None:
+            break
+        best = _LANGUAGE_RANKS[match.lastgroup]
+        # 更早的位置没有任何关键字, 从本次命中之后继续
+        pos = match.start() + 1
+
+    return LANGUAGE_KEYWORDS[best][0] if best < len(LANGUAGE_KEYWORDS) else '其他'
 
-    print(f"\n📊 总体统计:")
-    print(f"   ✅ 成功加载: {len(skills)} 个 SKILL.md 文件")
-    print(f"   ❌ 加载失败: {len(errors)} 个文件")
-    print(f"   📁 总计扫描: {len(skills) + len(errors)} 个技能")
+
+def format_statistics(skills: List[Dict], errors: List[Dict]) -> Iterator[str]:
+    """逐行生成详细统计信息"""
+    yield "\n╔════════════════════════════════════════════════════════════╗"
+    yield "║           🎯 SKILL.md 功能验证报告                        ║"
+    yield "╚════════════════════════════════════════════════════════════╝"
+
+    yield f"\n📊 总体统计:"
+    yield f"   ✅ 成功加载: {len(skills)} 个 SKILL.md 文件"
+    yield f"   ❌ 加载失败: {len(errors)} 个文件"
+    yield f"   📁 总计扫描: {len(skills) + len(errors)} 个技能"
 
     if not skills and not errors:
-        print("\n⚠️  警告: 未找到任何 SKILL.md 文件")
+        yield "\n⚠️  警告: 未找到任何 SKILL.md 文件"
         return
 
     # 成功加载的技能详情
     if skills:
-        print("\n✅ 成功加载的技能:")
+        yield "\n✅ 成功加载的技能:"
 
-        total_lines = 0
-        tags_counter = Counter()
-        langs_counter = Counter()
-        versions_counter = Counter()
+        # 汇总统计按列一次性计算, 下面的循环只负责格式化
+        total_lines = sum(skill['line_count'] for skill in skills)
+        tags_counter = Counter(chain.from_iterable(skill['metadata']['tags'] for skill in skills))
+        langs_counter = Counter(skill['language'] for skill in skills)
+        versions_counter = Counter(skill['metadata'].get('version', 'unknown') for skill in skills)
 
         for i, skill in enumerate(skills, 1):
+            # 每个字段只查找一次; version 是必需字段, 加载成功的技能都有
             metadata = skill['metadata']
-            content = skill['content']
-            path = skill['path']
-
-            line_count = len(content.split('\n'))
-            total_lines += line_count
-
-            print(f"\n   {i}. {metadata.get('name', 'Unknown')}")
-            print(f"      📂 路径: {path.name}")
-            print(f"      📝 描述: {metadata.get('description', 'N/A')[:80]}...")
-            print(f"      🏷️  版本: {metadata.get('version', 'N/A')}")
+            get = metadata.get
+            name = get('name', 'Unknown')
+            description = get('description', 'N/A')
+            version = get('version', 'unknown')
+            tags = metadata['tags']
+            deps = metadata['dependencies']
+            line_count = skill['line_count']
+
+            yield f"\n   {i}. {name}"
+            yield f"      📂 路径: {skill['path'].name}"
+            yield f"      📝 描述: {description[:80]}..."
+            yield f"      🏷️  版本: {version}"
 
             if 'author' in metadata:
-                print(f"      👤 作者: {metadata['author']}")
+                yield f"      👤 作者: {metadata['author']}"
 
-            print(f"      📄 内容行数: {line_count} 行")
+            yield f"      📄 内容行数: {line_count} 行"
 
-            # 标签
-            tags = metadata.get('tags', [])
+            # 标签和依赖在加载时已统一为元组
             if tags:
-                if isinstance(tags, list):
-                    tags_str = ', '.join(tags)
-                    for tag in tags:
-                        tags_counter[tag] += 1
-                else:
-                    tags_str = tags
-                print(f"      🏷️  标签: {tags_str}")
-
-            # 依赖
-            deps = metadata.get('dependencies', [])
+                yield f"      🏷️  标签: {', '.join(map(str, tags))}"
+
             if deps:
-                if isinstance(deps, list):
-                    deps_str = ', '.join(deps)
-                else:
-                    deps_str = deps
-                print(f"      🔗 依赖: {deps_str}")
-
-            # 统计语言
-            content_lower = content.lower()
-
-            # 检测中文
-            if '中文' in content_lower or '专家' in content_lower:
-                langs_counter['中文'] += 1
-            # 检测 Rust
-            elif 'rust' in content_lower or 'fn ' in content_lower or 'let mut' in content_lower:
-                langs_counter['Rust'] += 1
-            # 检测 Python
-            elif 'python' in content_lower or 'def ' in content_lower or 'import ' in content_lower:
-                langs_counter['Python'] += 1
-            # 检测 JavaScript/TypeScript
-            elif 'javascript' in content_lower or 'typescript' in content_lower or 'const ' in content_lower:
-                langs_counter['JavaScript/TypeScript'] += 1
-            # 检测 Swift
-            elif 'swift' in content_lower or '@main' in content_lower:
-                langs_counter['Swift'] += 1
-            # 检测 Kotlin
-            elif 'kotlin' in content_lower or 'fun ' in content_lower:
-                langs_counter['Kotlin'] += 1
-            # 检测 Go
-            elif ' go ' in content_lower or 'func ' in content_lower:
-                langs_counter['Go'] += 1
-            # 检测 SQL
-            elif 'sql' in content_lower or 'select ' in content_lower:
-                langs_counter['SQL'] += 1
-            else:
-                langs_counter['其他'] += 1
-
-            # 版本统计
-            version = metadata.get('version', 'unknown')
-            versions_counter[version] += 1
+                yield f"      🔗 依赖: {', '.join(map(str, deps))}"
 
         # 总体统计
-        print(f"\n📈 内容统计:")
-        print(f"   📝 总内容行数: {total_lines:,} 行")
-        print(f"   📊 平均行数: {total_lines // len(skills)} 行/技能")
+        yield f"\n📈 内容统计:"
+        yield f"   📝 总内容行数: {total_lines:,} 行"
+        yield f"   📊 平均行数: {total_lines // len(skills)} 行/技能"
 
         # 语言分布
         if langs_counter:
-            print(f"\n🌐 编程语言分布:")
+            yield f"\n🌐 编程语言分布:"
             for lang, count in langs_counter.most_common():
-                print(f"      - {lang}: {count} 个技能")
+                yield f"      - {lang}: {count} 个技能"
 
         # 热门标签
         if tags_counter:
-            print(f"\n🏷️  热门标签:")
+            yield f"\n🏷️  热门标签:"
             for tag, count in tags_counter.most_common(10):
-                print(f"      - {tag}: {count} 个技能")
+                yield f"      - {tag}: {count} 个技能"
 
         # 版本分布
         if versions_counter:
-            print(f"\n📊 版本分布:")
+            yield f"\n📊 版本分布:"
             for version, count in versions_counter.most_common():
-                print(f"   v{version}: {count} 个技能")
+                yield f"   v{version}: {count} 个技能"
 
     # 加载失败的文件
     if errors:
-        print(f"\n❌ 加载失败的文件:")
+        yield f"\n❌ 加载失败的文件:"
         for i, error in enumerate(errors, 1):
-            print(f"\n   {i}. {error['path']}")
-            print(f"      ⚠️  错误: {error['error']}")
+            yield f"\n   {i}. {error['path']}"
+            yield f"      ⚠️  错误: {error['error']}"
+
+    yield f"\n✅ 验证完成!"
+    yield "╔════════════════════════════════════════════════════════════╗"
+    yield "║              SKILL.md 功能验证完成                         ║"
+    yield "╚════════════════════════════════════════════════════════════╝\n"
+
+
+def print_statistics(skills: List[Dict], errors: List[Dict]):
+    """打印详细统计信息
+
+    输出到终端时逐行打印; 重定向到文件或管道时合并为一次写入。
+    """
+    lines = format_statistics(skills, errors)
+    if sys.stdout.isatty():
+        for line in lines:
+            print(line)
+    else:
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+
 
-    print(f"\n✅ 验证完成!")
-    print("╔════════════════════════════════════════════════════════════╗")
-    print("║              SKILL.md 功能验证完成                         ║")
-    print("╚════════════════════════════════════════════════════════════╝\n")
+def build_report(skills: List[Dict], errors: List[Dict]) -> Dict:
+    """生成供程序读取的完整验证结果"""
+    return {
+        'skills': [dict(skill, path=skill['path'].name) for skill in skills],
+        'errors': errors
+    }
 
 
 def main():
-    print("🔍 开始验证 SKILL.md 功能...\n")
+    import argparse
+
+    parser = argparse.ArgumentParser(description='验证 SKILL.md 文件')
+    parser.add_argument('--json', action='store_true', help='以 JSON 格式输出完整验证结果')
+    args = parser.parse_args()
 
     # 获取项目根目录
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     skills_dir = project_root / "examples" / ".claude" / "skills"
 
+    if args.json:
+        skills, errors = scan_skills_dir(skills_dir)
+        sys.stdout.buffer.write(_dumps(build_report(skills, errors)) + b'\n')
+        sys.exit(1 if errors or not skills else 0)
+
+    print("🔍 开始验证 SKILL.md 功能...\n")
     print(f"📁 扫描目录: {skills_dir}")
 
     # 扫描所有技能